@@ -0,0 +1,114 @@
+"""
+One-off migration to create the indexes of the simulation database models on a
+database whose tables already exist. create_all only creates indexes together with new
+tables, so this is run once after deploying, e.g. `python create_indexes.py` in the
+backend container, rather than on every connection.
+
+The indexes are built concurrently so that logs can still be written while they are
+built. A concurrent build that fails or is interrupted leaves an invalid index behind,
+which is dropped and built again here.
+"""
+
+import sys
+from urllib.parse import quote_plus
+
+from config import (
+    SIMULATION_DATABASE_HOST,
+    SIMULATION_DATABASE_PASSWORD,
+    SIMULATION_DATABASE_PORT,
+    SIMULATION_DATABASE_USER,
+)
+from sqlalchemy import Connection, create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Name, table and definition of each index, matching the __table_args__ of the models
+# in simulation_database.py and frontend/core/simulation_database.py.
+INDEXES = (
+    ("ix_logs_sim_run_ts", "logs", '(simulation_run_id, "timestamp")'),
+    ("ix_parameters_sim_run", "parameters", "(simulation_run_id)"),
+    ("brin_runs_start", "simulation_runs", "USING brin (start_timestamp)"),
+)
+
+# Key of the advisory lock held while the indexes are created, so that two runs of the
+# migration do not build the same index at the same time.
+LOCK_KEY = 7_240_001
+
+_INDEX_VALIDITY_QUERY = text(
+    "SELECT pg_index.indisvalid FROM pg_index "
+    "JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+    "WHERE pg_class.relname = :name"
+)
+_TABLE_EXISTS_QUERY = text("SELECT to_regclass(:table) IS NOT NULL")
+
+
+def create_index(connection: Connection, name: str, table: str, definition: str):
+    """
+    Create an index concurrently, unless a valid index with the same name already
+    exists. An invalid index left by a failed build is dropped and built again.
+
+    Parameters
+    ----------
+    connection : Connection
+        The connection to the database, in autocommit mode.
+    name : str
+        The name of the index.
+    table : str
+        The name of the table of the index.
+    definition : str
+        The columns of the index, with the index method if it is not a B-tree.
+    """
+    if not connection.execute(_TABLE_EXISTS_QUERY, {"table": table}).scalar():
+        print(f"Skipping {name}: table {table} does not exist")
+        return
+
+    is_valid = connection.execute(_INDEX_VALIDITY_QUERY, {"name": name}).scalar()
+    if is_valid:
+        print(f"Skipping {name}: index already exists")
+        return
+    if is_valid is False:
+        print(f"Dropping invalid index {name}")
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+
+    print(f"Creating index {name}")
+    connection.execute(
+        text(f"CREATE INDEX CONCURRENTLY {name} ON {table} {definition}")
+    )
+
+
+def main() -> int:
+    """
+    Create the indexes of the simulation database.
+
+    Returns
+    -------
+    int
+        The exit code; 0 if all indexes exist and are valid, 1 otherwise.
+    """
+    database_url = (
+        f"postgresql://{quote_plus(SIMULATION_DATABASE_USER)}:{quote_plus(SIMULATION_DATABASE_PASSWORD)}"
+        f"@{SIMULATION_DATABASE_HOST}:{SIMULATION_DATABASE_PORT}/matrix_simulation"
+    )
+    engine = create_engine(database_url)
+    try:
+        # Indexes cannot be built concurrently inside a transaction.
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as connection:
+            connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": LOCK_KEY})
+            try:
+                for name, table, definition in INDEXES:
+                    create_index(connection, name, table, definition)
+            finally:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": LOCK_KEY}
+                )
+    except SQLAlchemyError as e:
+        print(f"Error creating indexes: {e}")
+        return 1
+    finally:
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
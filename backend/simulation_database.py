@@ -6,7 +6,7 @@ from config import (
     SIMULATION_DATABASE_PORT,
     SIMULATION_DATABASE_USER,
 )
-from sqlalchemy import Column, Float, Integer, String, create_engine, text
+from sqlalchemy import Column, Float, Index, Integer, String, create_engine, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import declarative_base, sessionmaker
 
@@ -32,6 +32,9 @@ class SimulationRun(Base):
     """
 
     __tablename__ = "simulation_runs"
+    __table_args__ = (
+        Index("brin_runs_start", "start_timestamp", postgresql_using="brin"),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String)
@@ -63,6 +66,7 @@ class Log(Base):
     """
 
     __tablename__ = "logs"
+    __table_args__ = (Index("ix_logs_sim_run_ts", "simulation_run_id", "timestamp"),)
 
     id = Column(Integer, primary_key=True)
     timestamp = Column(Float)
@@ -1,9 +1,9 @@
-from typing import List, Tuple, Dict
+from typing import List, Optional, Tuple, Dict
 
 import numpy
 import pandas
-from matplotlib import axes, figure, patches, pyplot
-from matplotlib.animation import FuncAnimation
+from matplotlib import axes, figure, patches, text
+from matplotlib.animation import FFMpegWriter, FuncAnimation
 
 DROP_ACTION = "LOGC"
 PICK_ACTION = "LOGO"
@@ -55,6 +55,31 @@ class ZOrder:
     TIME_TEXT = 6
 
 
+class VideoSettings:
+    """
+    Class to store the settings used to render the animation into a video file.
+    """
+
+    # Interval between frames in milliseconds, which also sets the frame rate of the
+    # saved video.
+    FRAME_INTERVAL_MS = 100
+
+    # Resolution of the saved frames. The grid is drawn with flat colours, so a low
+    # resolution is enough to keep the labels readable.
+    DPI = 80
+
+    # "h264" (rather than "libx264") lets matplotlib round the frame size to even
+    # dimensions and select the yuv420p pixel format, both required by the encoder.
+    CODEC = "h264"
+
+    # Favour encoding speed over file size, since rendering dominates the wait time.
+    FFMPEG_EXTRA_ARGS = ["-preset", "ultrafast", "-crf", "28", "-tune", "animation"]
+
+    # Maximum number of frames in an animation. Longer periods are sampled with a
+    # coarser time step, since skycars move linearly between events anyway.
+    MAX_FRAMES = 600
+
+
 class Animation:
     """
     Class to contain initialisation and animation methods
@@ -67,6 +92,12 @@ class Animation:
     step_data : Dict[int, pandas.DataFrame]
         Dictionary where the key is the skycar index and the value is the step data
         (data with only child entries)
+    summary_arrays : Dict[int, Dict[str, numpy.ndarray]]
+        Dictionary where the key is the skycar index and the value is the summary data
+        as one array per column, used for fast lookups during animation.
+    step_arrays : Dict[int, Dict[str, numpy.ndarray]]
+        Dictionary where the key is the skycar index and the value is the step data as
+        one array per column, used for fast lookups during animation.
     skycar_indices : List[int]
         The list of skycar indices.
     times : range
@@ -100,10 +131,10 @@ class Animation:
     path_lines : Dict[int, patches.Rectangle]
         Dictionary where the key is the skycar index and the value is the path line object
         for animation.
-    skycar_texts : Dict[int, pyplot.Text]
+    skycar_texts : Dict[int, text.Text]
         Dictionary where the key is the skycar index and the value is the text object to
         indicate skycar index on top of the skycar object.
-    time_text : pyplot.Text
+    time_text : text.Text
         The time text object for animation.
     stations : List[patches.Rectangle]
         The station objects for animation.
@@ -111,6 +142,18 @@ class Animation:
         The buffer objects for animation.
     unavailable_sections : List[patches.Rectangle]
         The unavailable section objects for animation.
+    _blit_artists : List
+        The artists that change between frames, returned by every animation callback.
+        The static sections are left out so that they stay in the cached background.
+    _last_step_index : Dict[int, int]
+        Dictionary where the key is the skycar index and the value is the index of the
+        step row found by the last lookup, reused while it still brackets the time.
+    _last_summary_index : Dict[int, int]
+        Dictionary where the key is the skycar index and the value is the index of the
+        summary row found by the last lookup, reused while it still brackets the time.
+    _drawn_state : Dict[int, Tuple[int, bool]]
+        Dictionary where the key is the skycar index and the value is the summary index
+        and halting state currently drawn, used to skip unchanged artist updates.
 
     Parameters
     ----------
@@ -126,6 +169,8 @@ class Animation:
 
     summary_data: Dict[int, pandas.DataFrame]
     step_data: Dict[int, pandas.DataFrame]
+    summary_arrays: Dict[int, Dict[str, numpy.ndarray]]
+    step_arrays: Dict[int, Dict[str, numpy.ndarray]]
     skycar_indices: List[int]
     times: range
     delta_time: int
@@ -142,11 +187,15 @@ class Animation:
     skycars: Dict[int, patches.Rectangle]
     future_coord_cells: Dict[int, patches.Rectangle]
     path_lines: Dict[int, patches.Rectangle]
-    skycar_texts: Dict[int, pyplot.Text]
-    time_text: pyplot.Text
+    skycar_texts: Dict[int, text.Text]
+    time_text: text.Text
     stations: List[patches.Rectangle]
     buffers: List[patches.Rectangle]
     unavailable_sections: List[patches.Rectangle]
+    _blit_artists: List
+    _last_step_index: Dict[int, int]
+    _last_summary_index: Dict[int, int]
+    _drawn_state: Dict[int, Tuple[int, bool]]
 
     def __init__(
         self,
@@ -216,9 +265,11 @@ class Animation:
 
         step_data: Dict[int, pandas.DataFrame] = {}
         summary_data: Dict[int, pandas.DataFrame] = {}
+        step_arrays: Dict[int, Dict[str, numpy.ndarray]] = {}
+        summary_arrays: Dict[int, Dict[str, numpy.ndarray]] = {}
 
+        summary_mask = movement_data["action"].str.contains("LOG")
         for skycar_index in skycar_indices:
-            summary_mask = movement_data["action"].str.contains("LOG")
             summary_data[skycar_index] = movement_data[
                 (summary_mask) & (movement_data["skycar_id"] == skycar_index)
             ]
@@ -226,9 +277,36 @@ class Animation:
                 (~summary_mask) & (movement_data["skycar_id"] == skycar_index)
             ]
 
+            # Coordinates are small grid integers, so single precision is enough. Times
+            # are epoch seconds with fractions, so they stay in double precision.
+            skycar_step_data = step_data[skycar_index]
+            step_arrays[skycar_index] = {
+                "completed_at": skycar_step_data["completed_at"].to_numpy(
+                    dtype=numpy.float64
+                ),
+                "begin_at": skycar_step_data["begin_at"].to_numpy(dtype=numpy.float64),
+                "prev_x": skycar_step_data["prev_x"].to_numpy(dtype=numpy.float32),
+                "prev_y": skycar_step_data["prev_y"].to_numpy(dtype=numpy.float32),
+                "x": skycar_step_data["x"].to_numpy(dtype=numpy.float32),
+                "y": skycar_step_data["y"].to_numpy(dtype=numpy.float32),
+            }
+            skycar_summary_data = summary_data[skycar_index]
+            summary_arrays[skycar_index] = {
+                "begin_at": skycar_summary_data["begin_at"].to_numpy(
+                    dtype=numpy.float64
+                ),
+                "x": skycar_summary_data["x"].to_numpy(dtype=numpy.float32),
+                "y": skycar_summary_data["y"].to_numpy(dtype=numpy.float32),
+                "action": skycar_summary_data["action"].to_numpy(dtype=object),
+            }
+
         self.summary_data = summary_data
         self.step_data = step_data
+        self.summary_arrays = summary_arrays
+        self.step_arrays = step_arrays
         self.skycar_indices = skycar_indices
+        self._last_step_index = {skycar_index: -1 for skycar_index in skycar_indices}
+        self._last_summary_index = {skycar_index: -1 for skycar_index in skycar_indices}
 
     def initialise_figure(self):
         """
@@ -236,9 +314,12 @@ class Animation:
         """
         # Ratio to keep the maximum dimension of the grid to 10 units.
         fig_ratio = 10 / max(self.lim_x, self.lim_y)
-        fig, ax = pyplot.subplots(
-            1, 1, figsize=(self.lim_x * fig_ratio, self.lim_y * fig_ratio)
-        )
+
+        # Create the figure directly instead of through pyplot, so that it is not
+        # registered with the global figure manager and is freed once the animation is
+        # no longer referenced.
+        fig = figure.Figure(figsize=(self.lim_x * fig_ratio, self.lim_y * fig_ratio))
+        ax = fig.add_subplot(1, 1, 1)
 
         ax.set_xlim(0, self.lim_x)
         ax.set_ylim(0, self.lim_y)
@@ -267,7 +348,7 @@ class Animation:
         # Get the actual start time of the simulation from logs.
         simulation_start_time = min(
             [
-                int(self.step_data[skycar_index]["completed_at"].min())
+                int(self.step_arrays[skycar_index]["completed_at"].min())
                 for skycar_index in self.skycar_indices
             ]
         )
@@ -280,21 +361,24 @@ class Animation:
         # maximum time intended by the users + 2 seconds (reason stated above)
         max_time = min(
             [
-                int(self.step_data[skycar_index]["completed_at"].max())
+                int(self.step_arrays[skycar_index]["completed_at"].max())
                 for skycar_index in self.skycar_indices
             ]
         )
         max_time = min(max_time, simulation_start_time + (to_time_min * 60) + 2)
 
-        # The duration between each frame of the animation is set to 1 second.
-        self.delta_time = 1
+        # The duration between each frame of the animation is 1 second, unless the
+        # period is too long, in which case it grows to keep at most MAX_FRAMES frames.
+        self.delta_time = max(
+            1, -(-(max_time - initial_time) // VideoSettings.MAX_FRAMES)
+        )
 
         self.times = numpy.arange(initial_time, max_time, self.delta_time)
         self.initial_time = self.times[0]
         self.simulation_start_time = simulation_start_time
 
         # Create time display at top left corner of the animation
-        time_text = pyplot.text(
+        time_text = self.ax.text(
             0.5,
             0.5,
             f"Time: {(self.initial_time-self.simulation_start_time)/60} mins ",
@@ -358,10 +442,21 @@ class Animation:
         path_lines = {}
         skycar_texts = {}
 
-        for skycar_index in self.skycar_indices:
-            coords, future_coords, action, is_halting = self.get_skycar_info_at_time(
+        skycar_infos = [
+            self.get_skycar_info_at_time(
                 skycar_index=skycar_index, time=self.initial_time
             )
+            for skycar_index in self.skycar_indices
+        ]
+        path_rects = self._path_rects(
+            current_coords=numpy.array([info[0] for info in skycar_infos]),
+            future_coords=numpy.array([info[1] for info in skycar_infos]),
+        )
+
+        for skycar_index, skycar_info, path_geometry in zip(
+            self.skycar_indices, skycar_infos, zip(*path_rects)
+        ):
+            coords, future_coords, action, is_halting = skycar_info
             if DROP_ACTION in action:
                 colour = Colours.DROP_COLOUR
             elif PICK_ACTION in action:
@@ -397,29 +492,14 @@ class Animation:
             )
 
             # Create path line from current position to future position
-            current_x, current_y = coords[0], coords[1]
-            future_x, future_y = future_coords[0], future_coords[1]
-
-            # Calculate path line dimensions based on direction. If dx > dy, the path line
-            # is horizontal, otherwise it is vertical.
-            dx = future_x - current_x
-            dy = future_y - current_y
-            if abs(dx) > abs(dy):
-                path_width = abs(dx) + 1
-                path_height = 1
-                path_x = min(current_x, future_x)
-                path_y = future_y
-            else:
-                path_width = 1
-                path_height = abs(dy) + 1
-                path_x = future_x
-                path_y = min(current_y, future_y)
-
+            path_x, path_y, path_width, path_height = path_geometry
             path_lines[skycar_index] = patches.Rectangle(
                 (path_x, path_y),
                 path_width,
                 path_height,
-                color=Colours.PATH_COLOUR,
+                color=(
+                    Colours.PATH_COLOUR if not is_halting else Colours.PATH_HALT_COLOUR
+                ),
                 alpha=0.8,
                 zorder=ZOrder.PATH if not is_halting else ZOrder.PATH_HALT,
             )
@@ -427,7 +507,7 @@ class Animation:
             # Create text label for skycar index. Position at center of skycar rectangle
             text_x = coords[0] + 0.5
             text_y = coords[1] + 0.5
-            skycar_texts[skycar_index] = pyplot.text(
+            skycar_texts[skycar_index] = self.ax.text(
                 text_x,
                 text_y,
                 str(skycar_index),
@@ -442,6 +522,60 @@ class Animation:
         self.future_coord_cells = future_coord_cells
         self.path_lines = path_lines
         self.skycar_texts = skycar_texts
+        self._drawn_state = {
+            skycar_index: (self._last_summary_index[skycar_index], skycar_info[3])
+            for skycar_index, skycar_info in zip(self.skycar_indices, skycar_infos)
+        }
+
+        # The set of moving artists is fixed, so build the list returned to the blitting
+        # machinery once instead of on every frame.
+        self._blit_artists = [
+            *self.path_lines.values(),
+            *self.future_coord_cells.values(),
+            *self.skycars.values(),
+            *self.skycar_texts.values(),
+            self.time_text,
+        ]
+
+    @staticmethod
+    def _path_rects(
+        current_coords: numpy.ndarray, future_coords: numpy.ndarray
+    ) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """
+        Calculate the path rectangles from the current to the future positions of all
+        skycars. If dx > dy, the path is horizontal, otherwise it is vertical.
+
+        Parameters
+        ----------
+        current_coords : numpy.ndarray
+            The current positions of the skycars, with shape (number of skycars, 2).
+        future_coords : numpy.ndarray
+            The future positions of the skycars, with shape (number of skycars, 2).
+
+        Returns
+        -------
+        (path_x, path_y, path_width, path_height) : Tuple[numpy.ndarray, ...]
+            The bottom left corner, width and height of each path rectangle.
+        """
+        current_coords = current_coords.reshape(-1, 2)
+        future_coords = future_coords.reshape(-1, 2)
+        dx = future_coords[:, 0] - current_coords[:, 0]
+        dy = future_coords[:, 1] - current_coords[:, 1]
+        is_horizontal = numpy.abs(dx) > numpy.abs(dy)
+
+        path_width = numpy.where(is_horizontal, numpy.abs(dx) + 1, 1)
+        path_height = numpy.where(is_horizontal, 1, numpy.abs(dy) + 1)
+        path_x = numpy.where(
+            is_horizontal,
+            numpy.minimum(current_coords[:, 0], future_coords[:, 0]),
+            future_coords[:, 0],
+        )
+        path_y = numpy.where(
+            is_horizontal,
+            future_coords[:, 1],
+            numpy.minimum(current_coords[:, 1], future_coords[:, 1]),
+        )
+        return path_x, path_y, path_width, path_height
 
     def get_skycar_info_at_time(
         self, skycar_index: int, time: int
@@ -467,43 +601,70 @@ class Animation:
         is_halting : bool
             Whether the skycar is halting.
         """
-        skycar_step_data = self.step_data[skycar_index]
-        step_row = skycar_step_data[skycar_step_data["completed_at"] > time].iloc[0]
+        # The step data is sorted by completion time, so the current step is the first
+        # one completed after the given time. Consecutive frames usually fall within the
+        # same step, so the previous step is reused while it still brackets the time.
+        steps = self.step_arrays[skycar_index]
+        step_index = self._last_step_index[skycar_index]
+        if not (
+            0 <= step_index < len(steps["completed_at"])
+            and steps["completed_at"][step_index] > time
+            and (step_index == 0 or steps["completed_at"][step_index - 1] <= time)
+        ):
+            step_index = int(
+                numpy.searchsorted(steps["completed_at"], time, side="right")
+            )
+            self._last_step_index[skycar_index] = step_index
+        completed_at = steps["completed_at"][step_index]
+        begin_at = steps["begin_at"][step_index]
+        prev_x, prev_y = steps["prev_x"][step_index], steps["prev_y"][step_index]
 
-        begin_to_completed_time_diff = step_row["completed_at"] - step_row["begin_at"]
-        begin_to_current_time_diff = time - step_row["begin_at"]
+        begin_to_completed_time_diff = completed_at - begin_at
+        begin_to_current_time_diff = time - begin_at
 
         # If the skycar has not moved yet, the current position is the previous position.
         if begin_to_current_time_diff <= 0.0:
-            current_x = step_row["prev_x"]
-            current_y = step_row["prev_y"]
+            current_x = prev_x
+            current_y = prev_y
         else:
             # If the skycar has moved, the current position is the previous position +
             # the distance travelled since the beginning of the step.
             current_x = (
-                step_row["prev_x"]
-                + ((step_row["x"] - step_row["prev_x"]) / begin_to_completed_time_diff)
+                prev_x
+                + ((steps["x"][step_index] - prev_x) / begin_to_completed_time_diff)
                 * begin_to_current_time_diff
             )
             current_y = (
-                step_row["prev_y"]
-                + ((step_row["y"] - step_row["prev_y"]) / begin_to_completed_time_diff)
+                prev_y
+                + ((steps["y"][step_index] - prev_y) / begin_to_completed_time_diff)
                 * begin_to_current_time_diff
             )
 
         # If the skycar is expected to not move in the next 2 seconds, we consider it
         # as halting.
-        if time - step_row["completed_at"] <= -2:
+        if time - completed_at <= -2:
             is_halting = True
         else:
             is_halting = False
 
-        skycar_summary_data = self.summary_data[skycar_index]
-        summary_row = skycar_summary_data[skycar_summary_data["begin_at"] <= time].iloc[
-            -1
-        ]
-        future_x, future_y = summary_row["x"], summary_row["y"]
-        action = summary_row["action"]
+        # The summary row is the last main entry that began at or before the given time,
+        # reusing the previous one while it still brackets the time.
+        summary = self.summary_arrays[skycar_index]
+        summary_index = self._last_summary_index[skycar_index]
+        if not (
+            0 <= summary_index < len(summary["begin_at"])
+            and summary["begin_at"][summary_index] <= time
+            and (
+                summary_index == len(summary["begin_at"]) - 1
+                or summary["begin_at"][summary_index + 1] > time
+            )
+        ):
+            summary_index = max(
+                int(numpy.searchsorted(summary["begin_at"], time, side="right")) - 1, 0
+            )
+            self._last_summary_index[skycar_index] = summary_index
+        future_x, future_y = summary["x"][summary_index], summary["y"][summary_index]
+        action = summary["action"][summary_index]
 
         return (current_x, current_y), (future_x, future_y), action, is_halting
 
@@ -514,7 +675,7 @@ class Animation:
         Returns
         -------
         List
-            The list of all elements to be plotted in the first frame.
+            The list of moving elements to be plotted in the first frame.
         """
         for buffer in self.buffers:
             self.ax.add_patch(buffer)
@@ -537,24 +698,10 @@ class Animation:
         for skycar in self.skycars.values():
             self.ax.add_patch(skycar)
 
-        # Add text labels fourth (highest z-order, on top of everything)
-        for text in self.skycar_texts.values():
-            self.ax.add_artist(text)
-
-        # Add time text (highest z-order)
-        self.ax.add_artist(self.time_text)
-
-        # Return all elements for animation
-        return (
-            list(self.buffers)
-            + list(self.unavailable_sections)
-            + list(self.stations)
-            + list(self.path_lines.values())
-            + list(self.future_coord_cells.values())
-            + list(self.skycars.values())
-            + list(self.skycar_texts.values())
-            + [self.time_text]
-        )
+        # Text labels and the time text are already attached to the axes on creation.
+
+        # Return the moving elements for animation
+        return self._blit_artists
 
     def animation_function(self, current_time) -> List:
         """
@@ -568,89 +715,88 @@ class Animation:
         Returns
         -------
         List
-            The list of all elements to be plotted in the current frame.
+            The list of moving elements to be plotted in the current frame.
         """
-        for skycar_index in self.skycar_indices:
-            coords, future_coords, action, is_halting = self.get_skycar_info_at_time(
-                skycar_index=skycar_index, time=current_time
-            )
+        skycar_infos = [
+            self.get_skycar_info_at_time(skycar_index=skycar_index, time=current_time)
+            for skycar_index in self.skycar_indices
+        ]
+        path_rects = self._path_rects(
+            current_coords=numpy.array([info[0] for info in skycar_infos]),
+            future_coords=numpy.array([info[1] for info in skycar_infos]),
+        )
 
-            # Update skycar position and color
+        for skycar_index, skycar_info, path_geometry in zip(
+            self.skycar_indices, skycar_infos, zip(*path_rects)
+        ):
+            coords, future_coords, action, is_halting = skycar_info
+
+            # Update skycar position
             skycar = self.skycars[skycar_index]
             skycar.set_xy(coords)
 
-            if DROP_ACTION in action:
-                colour = Colours.DROP_COLOUR
-            elif PICK_ACTION in action:
-                colour = Colours.PICK_COLOUR
-            else:
-                colour = Colours.NORMAL_COLOUR
-            skycar.set_facecolor(colour)
+            # The colour, the future coordinate cell and the path style only depend on
+            # the summary row and the halting state, so skip them if neither changed.
+            summary_index = self._last_summary_index[skycar_index]
+            previous_summary_index, was_halting = self._drawn_state[skycar_index]
+            is_summary_changed = summary_index != previous_summary_index
+            is_halting_changed = is_halting != was_halting
+            self._drawn_state[skycar_index] = (summary_index, is_halting)
+
+            if is_summary_changed:
+                if DROP_ACTION in action:
+                    colour = Colours.DROP_COLOUR
+                elif PICK_ACTION in action:
+                    colour = Colours.PICK_COLOUR
+                else:
+                    colour = Colours.NORMAL_COLOUR
+                skycar.set_facecolor(colour)
 
             # Update future coordinate cell position
             future_cell = self.future_coord_cells[skycar_index]
-            future_cell.set_xy(future_coords)
-            future_cell.set_color(
-                Colours.FUTURE_COORD_COLOUR
-                if not is_halting
-                else Colours.FUTURE_COORD_HALT_COLOUR
-            )
-            future_cell.set_zorder(
-                ZOrder.FUTURE_COORD if not is_halting else ZOrder.FUTURE_COORD_HALT
-            )
+            if is_summary_changed:
+                future_cell.set_xy(future_coords)
+            if is_halting_changed:
+                future_cell.set_color(
+                    Colours.FUTURE_COORD_COLOUR
+                    if not is_halting
+                    else Colours.FUTURE_COORD_HALT_COLOUR
+                )
+                future_cell.set_zorder(
+                    ZOrder.FUTURE_COORD if not is_halting else ZOrder.FUTURE_COORD_HALT
+                )
 
             # Update path rectangle from current to future position
-            current_x, current_y = coords[0], coords[1]
-            future_x, future_y = future_coords[0], future_coords[1]
-
-            # Calculate path dimensions based on direction
-            dx = future_x - current_x
-            dy = future_y - current_y
-
-            # Horizontal path
-            if abs(dx) > abs(dy):
-                path_width = abs(dx) + 1
-                path_height = 1
-                path_x = min(current_x, future_x)
-                path_y = future_y
-            # Vertical path
-            else:
-                path_width = 1
-                path_height = abs(dy) + 1
-                path_x = future_x
-                path_y = min(current_y, future_y)
-
-            # Update the path rectangle
+            path_x, path_y, path_width, path_height = path_geometry
             path_rect = self.path_lines[skycar_index]
             path_rect.set_xy((path_x, path_y))
             path_rect.set_width(path_width)
             path_rect.set_height(path_height)
-            path_rect.set_color(
-                Colours.PATH_COLOUR if not is_halting else Colours.PATH_HALT_COLOUR
-            )
-            path_rect.set_zorder(ZOrder.PATH if not is_halting else ZOrder.PATH_HALT)
+            if is_halting_changed:
+                path_rect.set_color(
+                    Colours.PATH_COLOUR if not is_halting else Colours.PATH_HALT_COLOUR
+                )
+                path_rect.set_zorder(
+                    ZOrder.PATH if not is_halting else ZOrder.PATH_HALT
+                )
 
             # Update text position to center of skycar
-            text = self.skycar_texts[skycar_index]
-            text.set_position((coords[0] + 0.5, coords[1] + 0.5))
+            skycar_text = self.skycar_texts[skycar_index]
+            skycar_text.set_position((coords[0] + 0.5, coords[1] + 0.5))
 
         # Update time display - show elapsed time since initial time
         elapsed_time = current_time - self.simulation_start_time
         self.time_text.set_text(f"Time: {elapsed_time/60:.2f} mins")
 
-        # Return all elements for animation
-        return (
-            list(self.buffers)
-            + list(self.unavailable_sections)
-            + list(self.stations)
-            + list(self.path_lines.values())
-            + list(self.future_coord_cells.values())
-            + list(self.skycars.values())
-            + list(self.skycar_texts.values())
-            + [self.time_text]
-        )
+        # Return the moving elements for animation
+        return self._blit_artists
 
-    def animate(self, save_filename: str = "") -> FuncAnimation:
+    def animate(
+        self,
+        save_filename: str = "",
+        dpi: int = VideoSettings.DPI,
+        extra_args: Optional[List[str]] = None,
+    ) -> FuncAnimation:
         """
         Main function to animate the skycars.
 
@@ -659,14 +805,46 @@ class Animation:
         save_filename : str, optional
             The filename to save the animation to, by default "", which means no file is
             saved.
+        dpi : int, optional
+            The resolution of the saved video, by default VideoSettings.DPI.
+        extra_args : List[str], optional
+            Extra arguments passed to ffmpeg, by default
+            VideoSettings.FFMPEG_EXTRA_ARGS.
+
+        Returns
+        -------
+        FuncAnimation
+            The animation object.
         """
+        # Frames are rendered once and written straight to the video, so there is no
+        # need for matplotlib to keep every frame time in its cache. The frame times are
+        # passed as an iterator, so the number of frames to save comes from save_count.
         anim = FuncAnimation(
             fig=self.fig,
             func=self.animation_function,
             init_func=self.start_frame,
-            frames=self.times,
-            interval=100,
+            frames=iter(self.times.tolist()),
+            interval=VideoSettings.FRAME_INTERVAL_MS,
             blit=True,
+            repeat=False,
+            cache_frame_data=False,
+            save_count=len(self.times),
         )
         if save_filename != "":
-            anim.save(f"{save_filename}", writer="ffmpeg")
+            writer = FFMpegWriter(
+                fps=1000 / VideoSettings.FRAME_INTERVAL_MS,
+                codec=VideoSettings.CODEC,
+                extra_args=(
+                    extra_args
+                    if extra_args is not None
+                    else VideoSettings.FFMPEG_EXTRA_ARGS
+                ),
+            )
+            anim.save(
+                f"{save_filename}",
+                writer=writer,
+                dpi=dpi,
+                savefig_kwargs={"facecolor": self.fig.get_facecolor()},
+            )
+
+        return anim
@@ -1,27 +1,63 @@
 """
 This file contains the configuration for the application.
+
+The values are read from the Streamlit secrets lazily, when each of them is first
+imported or accessed, and then kept as module attributes.
 """
 
 import streamlit
 
-TC_BASE_1 = streamlit.secrets["TC_BASE_1"]
-SM_BASE_1 = streamlit.secrets["SM_BASE_1"]
-SIMULATION_BASE_1 = streamlit.secrets["SIMULATION_BASE_1"]
-MONGO_HOST_1 = streamlit.secrets["MONGO_HOST_1"]
-MONGO_NAME_1 = streamlit.secrets["MONGO_NAME_1"]
-DASHBOARD_1 = streamlit.secrets["DASHBOARD_1"]
-
-TC_BASE_2 = streamlit.secrets["TC_BASE_2"]
-SM_BASE_2 = streamlit.secrets["SM_BASE_2"]
-SIMULATION_BASE_2 = streamlit.secrets["SIMULATION_BASE_2"]
-MONGO_HOST_2 = streamlit.secrets["MONGO_HOST_2"]
-MONGO_NAME_2 = streamlit.secrets["MONGO_NAME_2"]
-DASHBOARD_2 = streamlit.secrets["DASHBOARD_2"]
-
-SIMULATION_DATABASE_HOST = streamlit.secrets["SIMULATION_DATABASE_HOST"]
-SIMULATION_DATABASE_PORT = streamlit.secrets["SIMULATION_DATABASE_PORT"]
-SIMULATION_DATABASE_USER = streamlit.secrets["SIMULATION_DATABASE_USER"]
-SIMULATION_DATABASE_PASSWORD = streamlit.secrets["SIMULATION_DATABASE_PASSWORD"]
-
-MONGO_USER = streamlit.secrets["MONGO_USER"]
-MONGO_PASSWORD = streamlit.secrets["MONGO_PASSWORD"]
+_NAMES = {
+    "TC_BASE_1",
+    "SM_BASE_1",
+    "SIMULATION_BASE_1",
+    "MONGO_HOST_1",
+    "MONGO_NAME_1",
+    "DASHBOARD_1",
+    "TC_BASE_2",
+    "SM_BASE_2",
+    "SIMULATION_BASE_2",
+    "MONGO_HOST_2",
+    "MONGO_NAME_2",
+    "DASHBOARD_2",
+    "SIMULATION_DATABASE_HOST",
+    "SIMULATION_DATABASE_PORT",
+    "SIMULATION_DATABASE_USER",
+    "SIMULATION_DATABASE_PASSWORD",
+    "MONGO_USER",
+    "MONGO_PASSWORD",
+}
+
+# Optional values, with the default used when they are missing from the secrets.
+_DEFAULTS = {
+    # SQLAlchemy driver for the simulation database, e.g. "psycopg2" or "psycopg".
+    "SIMULATION_DATABASE_DRIVER": "psycopg2",
+}
+
+
+def __getattr__(name: str):
+    """
+    Read a configuration value from the Streamlit secrets on first access.
+
+    Parameters
+    ----------
+    name : str
+        The name of the configuration value.
+
+    Returns
+    -------
+    Any
+        The configuration value.
+    """
+    if name in _NAMES:
+        value = streamlit.secrets[name]
+    elif name in _DEFAULTS:
+        value = streamlit.secrets.get(name, _DEFAULTS[name])
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | _NAMES | set(_DEFAULTS))
@@ -1,20 +1,67 @@
+import atexit
+import math
+import threading
 import time
-from typing import Dict
+from typing import Dict, List, Tuple
 from urllib.parse import quote_plus
 
 import pandas
+import pyarrow
+import streamlit
 from core.config import (
+    SIMULATION_DATABASE_DRIVER,
     SIMULATION_DATABASE_HOST,
     SIMULATION_DATABASE_PASSWORD,
     SIMULATION_DATABASE_PORT,
     SIMULATION_DATABASE_USER,
 )
-from sqlalchemy import Column, Float, Integer, String, create_engine, text
+from sqlalchemy import (
+    Column,
+    Engine,
+    Float,
+    Index,
+    Integer,
+    String,
+    create_engine,
+    insert,
+    text,
+)
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 Base = declarative_base()
 
+# Engine and session factory shared by all SimulationDatabase instances of the process,
+# created on first use by _get_engine.
+_engine: Engine | None = None
+_session_factory: sessionmaker | None = None
+_engine_lock = threading.Lock()
+
+# Queries are built once at import instead of on every call.
+_RUNS_QUERY = text(
+    "SELECT * FROM get_simulation_runs_by_timestamp_range(:timestamp1, :timestamp2)"
+)
+_LOGS_QUERY = text("SELECT * FROM get_logs_by_simulation_run(:simulation_run_id)")
+_PARAMETERS_QUERY = text(
+    "SELECT * FROM public.parameters WHERE simulation_run_id = :simulation_run_id"
+)
+
+# Number of log rows fetched from the server-side cursor at a time.
+LOG_BATCH_SIZE = 10_000
+
+# Arrow types of the log columns, declared once so that they are not inferred for
+# every batch. Nullable integer columns keep their type even in all-null batches.
+LOG_SCHEMA = pyarrow.schema(
+    [
+        ("id", pyarrow.int64()),
+        ("timestamp", pyarrow.float64()),
+        ("simulation_run_id", pyarrow.int64()),
+        ("action", pyarrow.string()),
+        ("station_code", pyarrow.int64()),
+        ("bin_code", pyarrow.int64()),
+    ]
+)
+
 
 class SimulationRun(Base):
     """
@@ -35,6 +82,9 @@ class SimulationRun(Base):
     """
 
     __tablename__ = "simulation_runs"
+    __table_args__ = (
+        Index("brin_runs_start", "start_timestamp", postgresql_using="brin"),
+    )
 
     id = Column(Integer, primary_key=True)
     name = Column(String)
@@ -66,6 +116,7 @@ class Log(Base):
     """
 
     __tablename__ = "logs"
+    __table_args__ = (Index("ix_logs_sim_run_ts", "simulation_run_id", "timestamp"),)
 
     id = Column(Integer, primary_key=True)
     timestamp = Column(Float)
@@ -123,6 +174,7 @@ class Parameter(Base):
     """
 
     __tablename__ = "parameters"
+    __table_args__ = (Index("ix_parameters_sim_run", "simulation_run_id"),)
 
     id = Column(Integer, primary_key=True)
     simulation_run_id = Column(Integer)
@@ -145,20 +197,146 @@ class Parameter(Base):
     desired_skycar_directions_string = Column(String, nullable=True)
 
 
-class SimulationDatabase:
+@streamlit.cache_data(ttl=300, show_spinner=False)
+def _read_simulation_runs(
+    _engine: Engine, timestamp1: int, timestamp2: int
+) -> pandas.DataFrame:
     """
-    Class related to interacting with the simulation database.
+    Reads the simulation runs within a timestamp range. The result is cached for 5
+    minutes, since the list of runs only changes when a simulation starts or ends.
+
+    Parameters
+    ----------
+    _engine : Engine
+        The engine to connect with. It is not part of the cache key.
+    timestamp1 : int
+        The start timestamp of the range
+    timestamp2 : int
+        The end timestamp of the range
+
+    Returns
+    -------
+    pandas.DataFrame
+        A DataFrame of simulation runs within the specified timestamp range
     """
+    with _engine.connect() as connection:
+        return pandas.read_sql_query(
+            _RUNS_QUERY,
+            connection,
+            params={"timestamp1": float(timestamp1), "timestamp2": float(timestamp2)},
+        )
 
-    def __init__(self):
+
+@streamlit.cache_data(ttl=None, show_spinner=False)
+def _read_parameters(_engine: Engine, simulation_run_id: int) -> pandas.DataFrame:
+    """
+    Reads the parameters of a simulation run. The result is cached without expiry,
+    since the parameters of a run do not change once saved.
+
+    Parameters
+    ----------
+    _engine : Engine
+        The engine to connect with. It is not part of the cache key.
+    simulation_run_id : int
+        The ID of the simulation run
+
+    Returns
+    -------
+    pandas.DataFrame
+        A DataFrame of parameters for the specified simulation run
+    """
+    with _engine.connect() as connection:
+        return pandas.read_sql_query(
+            _PARAMETERS_QUERY,
+            connection,
+            params={"simulation_run_id": simulation_run_id},
+        )
+
+
+# The parameters are inserted through a Core statement prepared once, which skips the
+# per-row ORM object construction and attribute validation.
+_PARAMETER_INSERT = insert(Parameter.__table__).returning(Parameter.__table__.c.id)
+
+
+def _get_engine() -> Tuple[Engine, sessionmaker]:
+    """
+    Get the engine and the session factory of the simulation database, shared by all
+    SimulationDatabase instances of the process. They are created, and the tables with
+    them, on first use, so that the pooled connections are reused across reruns instead
+    of reconnecting for every instance.
+
+    Returns
+    -------
+    Tuple[Engine, sessionmaker]
+        The engine and the session factory.
+    """
+    global _engine, _session_factory
+    with _engine_lock:
+        if _engine is not None:
+            return _engine, _session_factory
+
+        # The driver is configurable, e.g. "psycopg" for the binary protocol of
+        # psycopg 3, and defaults to psycopg2.
         database_url = (
-            f"postgresql://{quote_plus(SIMULATION_DATABASE_USER)}:{quote_plus(SIMULATION_DATABASE_PASSWORD)}"
+            f"postgresql+{SIMULATION_DATABASE_DRIVER}://"
+            f"{quote_plus(SIMULATION_DATABASE_USER)}:{quote_plus(SIMULATION_DATABASE_PASSWORD)}"
             f"@{SIMULATION_DATABASE_HOST}:{SIMULATION_DATABASE_PORT}/matrix_simulation"
         )
-        self.engine = create_engine(database_url)
-        Session = sessionmaker(bind=self.engine)
-        self.session = Session()
-        Base.metadata.create_all(self.engine)
+        # Batch multi-row executes on psycopg2 instead of running one statement per row,
+        # and let psycopg 3 prepare statements that are executed repeatedly.
+        dialect_kwargs = {}
+        if SIMULATION_DATABASE_DRIVER == "psycopg2":
+            dialect_kwargs["executemany_mode"] = "values_plus_batch"
+        elif SIMULATION_DATABASE_DRIVER == "psycopg":
+            dialect_kwargs["connect_args"] = {"prepare_threshold": 5}
+
+        # Check connections before use and recycle them periodically, so that stale
+        # connections are replaced instead of failing the first query after idling.
+        engine = create_engine(
+            database_url,
+            pool_size=10,
+            max_overflow=20,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            pool_use_lifo=True,
+            insertmanyvalues_page_size=10_000,
+            **dialect_kwargs,
+        )
+
+        # The engine is only shared once the tables exist, so that a failure is retried
+        # by the next instance.
+        try:
+            Base.metadata.create_all(engine)
+        except Exception:
+            engine.dispose()
+            raise
+
+        _engine = engine
+        # Each method runs in its own transaction that commits on success and rolls
+        # back on error. Objects stay readable after commit, e.g. to return their ID.
+        _session_factory = sessionmaker(bind=engine, expire_on_commit=False)
+        return _engine, _session_factory
+
+
+def _dispose_engine():
+    """
+    Dispose the shared engine when the process exits.
+    """
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+
+
+atexit.register(_dispose_engine)
+
+
+class SimulationDatabase:
+    """
+    Class related to interacting with the simulation database.
+    """
+
+    def __init__(self):
+        self.engine, self.Session = _get_engine()
 
     def add_simulation_run(self, name: str, server_number: int) -> int | None:
         """
@@ -177,13 +355,40 @@ class SimulationDatabase:
             The ID of the simulation run if successful, None if unsuccessful.
         """
         try:
-            sim_run = SimulationRun(name=name, server_number=server_number)
-            self.session.add(sim_run)
-            self.session.commit()
+            with self.Session.begin() as session:
+                sim_run = SimulationRun(name=name, server_number=server_number)
+                session.add(sim_run)
+            _read_simulation_runs.clear()
             return sim_run.id
         except SQLAlchemyError as e:
             print(f"Error adding simulation run: {e}")
-            self.session.rollback()
+            return None
+
+    def add_simulation_runs_bulk(self, rows: List[Dict]) -> int | None:
+        """
+        Adds many simulation runs to the simulation_runs table in batched statements.
+
+        Parameters
+        ----------
+        rows : List[Dict]
+            The simulation runs to add. Each dictionary assumes that the keys are the
+            same as the attributes of the SimulationRun class.
+
+        Returns
+        -------
+        int | None
+            The number of simulation runs added if successful, None if unsuccessful.
+        """
+        if not rows:
+            return 0
+
+        try:
+            with self.Session.begin() as session:
+                session.execute(insert(SimulationRun), rows)
+            _read_simulation_runs.clear()
+            return len(rows)
+        except SQLAlchemyError as e:
+            print(f"Error adding simulation runs: {e}")
             return None
 
     def add_simulation_parameters(
@@ -206,15 +411,45 @@ class SimulationDatabase:
             The ID of the parameter entry if successful, None if unsuccessful.
         """
         try:
-            param = Parameter(
-                **parameters, simulation_run_id=simulation_run_id, timestamp=time.time()
-            )
-            self.session.add(param)
-            self.session.commit()
-            return param.id
+            with self.Session.begin() as session:
+                param_id = session.execute(
+                    _PARAMETER_INSERT,
+                    {
+                        **parameters,
+                        "simulation_run_id": simulation_run_id,
+                        "timestamp": time.time(),
+                    },
+                ).scalar_one()
+            _read_parameters.clear()
+            return param_id
         except SQLAlchemyError as e:
             print(f"Error adding simulation parameters: {e}")
-            self.session.rollback()
+            return None
+
+    def add_logs_bulk(self, rows: List[Dict]) -> int | None:
+        """
+        Adds many log entries to the logs table in batched statements.
+
+        Parameters
+        ----------
+        rows : List[Dict]
+            The log entries to add. Each dictionary assumes that the keys are the same
+            as the attributes of the Log class.
+
+        Returns
+        -------
+        int | None
+            The number of log entries added if successful, None if unsuccessful.
+        """
+        if not rows:
+            return 0
+
+        try:
+            with self.Session.begin() as session:
+                session.execute(insert(Log), rows)
+            return len(rows)
+        except SQLAlchemyError as e:
+            print(f"Error adding logs: {e}")
             return None
 
     def get_simulation_runs_by_timestamp_range(
@@ -236,18 +471,11 @@ class SimulationDatabase:
             A DataFrame of simulation runs within the specified timestamp range
         """
         try:
-            query = text(
-                f"""
-                SELECT * FROM 
-                get_simulation_runs_by_timestamp_range({timestamp1}, {timestamp2})
-                """
+            # Widen the range to whole seconds, so that nearby ranges share a cache
+            # entry without leaving out any run.
+            return _read_simulation_runs(
+                self.engine, math.floor(timestamp1), math.ceil(timestamp2)
             )
-            result = self.session.execute(query)
-            df = pandas.DataFrame(result.fetchall())
-            if not df.empty:
-                df.columns = result.keys()
-            return df
-    
         except SQLAlchemyError as e:
             print(f"Error retrieving simulation runs: {e}")
             return pandas.DataFrame()
@@ -267,21 +495,57 @@ class SimulationDatabase:
             A DataFrame of logs for the specified simulation run
         """
         try:
-            query = text(
-                f"""
-                SELECT * FROM get_logs_by_simulation_run({simulation_run_id})
-                """
-            )
-
-            result = self.session.execute(query)
-            df = pandas.DataFrame(result.fetchall())
-            if not df.empty:
-                df.columns = result.keys()
-            return df
+            # Stream the rows with a server-side cursor and convert each batch to
+            # Arrow, so that the full result is never held as Python row objects.
+            with self.engine.connect() as connection:
+                result = connection.execution_options(
+                    stream_results=True, max_row_buffer=LOG_BATCH_SIZE
+                ).execute(_LOGS_QUERY, {"simulation_run_id": int(simulation_run_id)})
+                columns = list(result.keys())
+                batches = [
+                    self._rows_to_arrow(rows=rows, columns=columns)
+                    for rows in result.partitions(LOG_BATCH_SIZE)
+                ]
+
+            if not batches:
+                return pandas.DataFrame(columns=columns)
+            table = pyarrow.concat_tables(batches, promote_options="default")
+            return table.to_pandas(self_destruct=True)
         except SQLAlchemyError as e:
             print(f"Error retrieving logs: {e}")
             return pandas.DataFrame()
 
+    @staticmethod
+    def _rows_to_arrow(rows: List, columns: List[str]) -> pyarrow.Table:
+        """
+        Converts a batch of log rows into an Arrow table, using the types of LOG_SCHEMA
+        for the known columns.
+
+        Parameters
+        ----------
+        rows : List
+            The rows of the batch.
+        columns : List[str]
+            The names of the columns of the rows.
+
+        Returns
+        -------
+        pyarrow.Table
+            The batch as an Arrow table.
+        """
+        arrays = [
+            pyarrow.array(
+                values,
+                type=(
+                    LOG_SCHEMA.field(column).type
+                    if column in LOG_SCHEMA.names
+                    else None
+                ),
+            )
+            for column, values in zip(columns, zip(*rows))
+        ]
+        return pyarrow.Table.from_arrays(arrays, names=columns)
+
     def get_parameters_by_simulation_run(
         self, simulation_run_id: int
     ) -> pandas.DataFrame:
@@ -299,24 +563,16 @@ class SimulationDatabase:
             A DataFrame of parameters for the specified simulation run
         """
         try:
-            query = text(
-                f"""
-                SELECT * FROM public.parameters
-                WHERE simulation_run_id = {simulation_run_id}
-                """
-            )
-            result = self.session.execute(query)
-            df = pandas.DataFrame(result.fetchall())
-            if not df.empty:
-                df.columns = result.keys()
-            return df
+            return _read_parameters(self.engine, int(simulation_run_id))
         except SQLAlchemyError as e:
             print(f"Error retrieving parameters: {e}")
             return pandas.DataFrame()
 
     def close_connection(self):
         """
-        Closes the database connection properly.
+        Release the database of the instance. The engine is shared by the process and
+        stays open, so that its pooled connections are reused by the next instance; it
+        is disposed when the process exits.
         """
-        self.session.close()
-        self.engine.dispose()
+        self.engine = None
+        self.Session = None
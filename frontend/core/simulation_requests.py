@@ -1,9 +1,110 @@
-import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional, Tuple
 
+import orjson
 import requests
 import streamlit
 from core.parameters import Parameters
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session(retry: bool = False) -> requests.Session:
+    """
+    Create a session with a connection pool, so that connections to the SM, TC and
+    backend servers are kept alive and reused across requests.
+
+    Parameters
+    ----------
+    retry : bool, optional
+        Whether to retry failed connections and gateway errors, by default False. Only
+        the steps of a run should retry; the health checks are polled with a short
+        timeout and should report a server that does not answer straight away.
+
+    Returns
+    -------
+    requests.Session
+        The session with the JSON content type header set by default.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        # Connection errors are retried with a short exponential backoff for every
+        # method, as the request never reached the server. Gateway errors are only
+        # retried for idempotent methods, and read timeouts are never retried, so that
+        # a POST the server may already have handled is not sent twice. The final
+        # response is returned as it is when the retries are used up.
+        max_retries=(
+            Retry(
+                total=3,
+                read=0,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=frozenset(["GET", "PUT"]),
+                raise_on_status=False,
+            )
+            if retry
+            else 0
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+
+# Session shared by all requests of the module, without retries.
+_SESSION = create_session()
+
+
+def _parse_json(response: requests.Response) -> Any:
+    """
+    Parse the JSON body of a response with orjson, directly from the raw bytes.
+
+    Parameters
+    ----------
+    response : requests.Response
+        The response to parse.
+
+    Returns
+    -------
+    Any
+        The parsed JSON body.
+    """
+    return orjson.loads(response.content)
+
+
+def _get_json(url: str, timeout: int | None = None) -> Any | None:
+    """
+    Send a GET request and parse its JSON body. Failures are logged once and reported
+    through the return value instead of an exception, which suits the health checks
+    that only need to know whether the server answered.
+
+    Parameters
+    ----------
+    url : str
+        The URL of the endpoint to send the request to.
+    timeout : int, optional
+        The timeout for the request in seconds, by default None.
+
+    Returns
+    -------
+    Any | None
+        The parsed JSON body, or None if the request failed or the response status is
+        not successful.
+    """
+    try:
+        response = _SESSION.get(url, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        print(f"Request failed: {str(e)}")
+        return None
+
+    if not response.ok:
+        print(f"Request failed: {response.status_code} {response.reason} for {url}")
+        return None
+
+    return _parse_json(response)
 
 
 class MosaicRequest:
@@ -28,16 +129,14 @@ class MosaicRequest:
         bool
             Whether the SM server is healthy.
         """
-        try:
-            sm_response = MosaicRequest.send_request(
-                url=f"{SM_base}/v3/settings/OrderDispatcher", method="GET", timeout=1
-            )
-            sm_real_response = json.loads(sm_response.text)
-            return sm_real_response["data"]["value"][Parameters.ZONE_NAME]["isActive"]
-
-        except requests.exceptions.RequestException as _:
+        sm_real_response = _get_json(
+            url=f"{SM_base}/v3/settings/OrderDispatcher", timeout=1
+        )
+        if sm_real_response is None:
             return False
 
+        return sm_real_response["data"]["value"][Parameters.ZONE_NAME]["isActive"]
+
     @staticmethod
     def TC_status_check(TC_base: str) -> Tuple[bool, bool | None]:
         """
@@ -63,21 +162,16 @@ class MosaicRequest:
             no simulation running. If None, it means the connection to the TC server is
             unsuccessful.
         """
-        try:
-            tc_response = MosaicRequest.send_request(
-                url=f"{TC_base}/operation/healthcheck", method="GET", timeout=1
-            )
-            tc_real_response = json.loads(tc_response.text)
-            is_healthy = True
-            is_tc_running = tc_real_response["model"]["cycle_stop"]["status"]
-
-            return is_healthy, is_tc_running
-
-        except requests.exceptions.RequestException as _:
+        tc_real_response = _get_json(url=f"{TC_base}/operation/healthcheck", timeout=1)
+        if tc_real_response is None:
             is_healthy = False
             is_tc_running = None
             return is_healthy, is_tc_running
 
+        is_healthy = True
+        is_tc_running = tc_real_response["model"]["cycle_stop"]["status"]
+        return is_healthy, is_tc_running
+
     @staticmethod
     def backend_status_check(
         simulation_base: str,
@@ -102,24 +196,20 @@ class MosaicRequest:
             The name of the simulation. If None, it means the connection to the backend
             server is unsuccessful.
         """
-        try:
-            response = MosaicRequest.send_request(
-                url=f"{simulation_base}/status",
-                method="GET",
-            )
-            real_response = json.loads(response.text)
-            simulation_name = real_response["simulation_name"]
-            is_simulation_completed = (
-                True if real_response["stop_time"] is not None else False
-            )
-            is_healthy = True
-            return is_healthy, is_simulation_completed, simulation_name
-        except requests.exceptions.RequestException as _:
+        real_response = _get_json(url=f"{simulation_base}/status", timeout=1)
+        if real_response is None:
             is_healthy = False
             is_simulation_completed = None
             simulation_name = None
             return is_healthy, is_simulation_completed, simulation_name
 
+        simulation_name = real_response["simulation_name"]
+        is_simulation_completed = (
+            True if real_response["stop_time"] is not None else False
+        )
+        is_healthy = True
+        return is_healthy, is_simulation_completed, simulation_name
+
     @staticmethod
     def general_check(
         TC_base: str, SM_base: str, simulation_base: str
@@ -153,11 +243,20 @@ class MosaicRequest:
             The name of the simulation. If None, it means the connection to the backend
             server is unsuccessful.
         """
-        is_sm_healthy = MosaicRequest.SM_health_check(SM_base)
-        is_tc_healthy, is_tc_running = MosaicRequest.TC_status_check(TC_base)
-        is_backend_healthy, is_simulation_completed, simulation_name = (
-            MosaicRequest.backend_status_check(simulation_base)
-        )
+        # The three checks are independent, so run them concurrently and wait for the
+        # slowest one instead of all of them in turn.
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            sm_future = executor.submit(MosaicRequest.SM_health_check, SM_base)
+            tc_future = executor.submit(MosaicRequest.TC_status_check, TC_base)
+            backend_future = executor.submit(
+                MosaicRequest.backend_status_check, simulation_base
+            )
+
+            is_sm_healthy = sm_future.result()
+            is_tc_healthy, is_tc_running = tc_future.result()
+            is_backend_healthy, is_simulation_completed, simulation_name = (
+                backend_future.result()
+            )
 
         is_healthy = is_sm_healthy and is_tc_healthy and is_backend_healthy
 
@@ -253,7 +352,8 @@ class MosaicRequest:
         data: Optional[Dict[str, Any]] = None,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, Any]] = None,
-        timeout: int | None = None,
+        timeout: float | Tuple[float, float] | None = None,
+        session: Optional[requests.Session] = None,
     ) -> requests.Response:
         """
         Send an HTTP request to the specified endpoint.
@@ -269,9 +369,14 @@ class MosaicRequest:
         params : Dict[str, Any], optional
             The URL parameters to include, by default None.
         headers : Dict[str, Any], optional
-            The headers to include in the request, by default None.
-        timeout : int, optional
-            The timeout for the request in seconds, by default None.
+            The headers to include in the request, by default None, which means only
+            the JSON content type header of the shared session is sent.
+        timeout : float | Tuple[float, float], optional
+            The timeout for the request in seconds, or the connect and read timeouts,
+            by default None.
+        session : requests.Session, optional
+            The session to send the request with, by default None, which means the
+            session shared by the module is used.
 
         Returns
         -------
@@ -283,15 +388,17 @@ class MosaicRequest:
         requests.exceptions.RequestException
             If the request fails.
         """
-
-        if headers is None:
-            headers = {"Content-Type": "application/json"}
+        # The body is encoded compactly with orjson, and the JSON content type header is
+        # already set on the session.
+        body = None
+        if data is not None:
+            body = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
 
         try:
-            response = requests.request(
+            response = (session if session is not None else _SESSION).request(
                 method=method.upper(),
                 url=url,
-                json=data,
+                data=body,
                 params=params,
                 headers=headers,
                 timeout=timeout,
@@ -1,3 +1,8 @@
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
 import requests
 import streamlit
 from core.config import (
@@ -9,15 +14,33 @@ from core.config import (
     TC_BASE_2,
 )
 from core.simulation_database import SimulationDatabase
-from core.simulation_requests import MosaicRequest
+from core.simulation_requests import MosaicRequest, create_session
 from ui_components.simulation_preparation import SimulationPreparationUI
 
+# Connect and read timeouts in seconds of the requests of the simulation steps, so that
+# an unresponsive server fails the step quickly instead of stalling the run.
+STEP_TIMEOUT = (1.5, 10)
+
+# Minimum time in seconds between two updates of the progress bar for the steps run
+# concurrently.
+PROGRESS_UPDATE_INTERVAL = 0.05
+
 
 class Simulator:
     """
     The main class to process the steps and send the relevant requests to relevant
     servers to start a simulation.
 
+    Attributes
+    ----------
+    session : requests.Session
+        The session used for the steps of a run, so that connections to the servers
+        are kept alive between the steps. Failed connections are retried.
+    payloads : Dict[str, dict]
+        The request payloads of the inputs, prepared once before the steps are run.
+    simulation_database : Optional[SimulationDatabase]
+        The simulation database, opened once for the steps of a run.
+
     Parameters
     ----------
     simulation_preparation_ui : SimulationPreparationUI
@@ -26,6 +49,9 @@ class Simulator:
 
     def __init__(self, simulation_preparation_ui: SimulationPreparationUI):
         self.simulation_preparation_ui = simulation_preparation_ui
+        self.session = create_session(retry=True)
+        self.payloads = {}
+        self.simulation_database = None
         self._set_server()
 
     def run(self, simulation_name: str):
@@ -39,7 +65,8 @@ class Simulator:
             The name of the simulation.
         """
         # Check if the server is healthy. Only proceed if the server is healthy or no 
-        # simulation is running in the server.
+        # simulation is running in the server. The check goes through the shared session
+        # without retries, so that an unavailable server is reported straight away.
         is_healthy, is_simulation_running, _, previous_simulation_name = (
             MosaicRequest.general_check(
                 TC_base=self.TC_BASE,
@@ -61,30 +88,139 @@ class Simulator:
             )
             return
 
-        # Steps to send the requests to the relevant servers to start a simulation.
-        steps = [
+        # Steps to send the requests to the relevant servers to start a simulation. The
+        # SM and TC setup steps go to different servers and do not depend on each
+        # other, so the two groups run concurrently, each keeping its own order. The
+        # remaining steps need both servers to be set up and run in order afterwards.
+        sm_setup_steps = [
             ("Reset Layout in SM", self._reset_layout),
             ("Initialise Setup in SM", self._initialise_setup),
             ("Configure SM Obstacles", self._configure_SM_obstacles),
             ("Configure Storage Layout in SM", self._configure_layout),
+        ]
+        tc_setup_steps = [
             ("Configure TC Obstacles", self._configure_TC_obstacles),
             ("Configure Skycar Setup in TC", self._configure_skycar_setup),
             ("Configure Skycar Constraints in TC", self._configure_skycar_constraints),
+        ]
+        final_steps = [
             ("Start Cube in TC", self._start_cube),
             ("Disable Autostore in SM", self._disable_autostore),
             ("Start Simulation in Backend", self._start_simulation),
             ("Save Simulation Parameters", self._save_simulation_parameters),
         ]
+        number_of_steps = len(sm_setup_steps) + len(tc_setup_steps) + len(final_steps)
+
+        self.payloads = self._prepare_payloads()
 
-        progress_bar = streamlit.progress(0)
+        # The progress bar carries the status text, so that each update is a single
+        # element update. The completions of the concurrent setup steps arrive in bursts,
+        # so they are shown at most once per PROGRESS_UPDATE_INTERVAL seconds.
+        progress_bar = streamlit.progress(0, text="Running: Setup in SM and TC")
         status_text = streamlit.empty()
-        for i, (step_name, step_func) in enumerate(steps):
-            status_text.text(f"Running: {step_name}")
-            _ = step_func()
-            progress_bar.progress((i + 1) / len(steps))
+        completed_steps = 0
+        last_update_time = time.monotonic()
+        self.simulation_database = SimulationDatabase()
+        try:
+            for step_name in self._run_concurrently(
+                step_groups=[sm_setup_steps, tc_setup_steps]
+            ):
+                completed_steps += 1
+                if time.monotonic() - last_update_time >= PROGRESS_UPDATE_INTERVAL:
+                    progress_bar.progress(
+                        completed_steps / number_of_steps,
+                        text=f"Completed: {step_name}",
+                    )
+                    last_update_time = time.monotonic()
+
+            for step_name, step_func in final_steps:
+                progress_bar.progress(
+                    completed_steps / number_of_steps, text=f"Running: {step_name}"
+                )
+                _ = step_func()
+                completed_steps += 1
+            progress_bar.progress(1.0, text="Completed")
+        except requests.exceptions.RequestException as e:
+            status_text.text(f"Simulation {simulation_name} failed to start.")
+            streamlit.error(f"Request to the simulation servers failed: {e}")
+            return
+        finally:
+            self.simulation_database.close_connection()
+            self.simulation_database = None
+            self.session.close()
 
         status_text.text(f"Simulation {simulation_name} started successfully!")
 
+    def _prepare_payloads(self) -> Dict[str, dict]:
+        """
+        Convert the inputs to the request payloads once, before the steps are run. The
+        simulation input is left out, as it is only complete once the simulation run is
+        added to the database.
+
+        Returns
+        -------
+        Dict[str, dict]
+            The request payloads, keyed by the name of the input.
+        """
+        ui = self.simulation_preparation_ui
+        return {
+            "zones_and_stations": ui.input_zones_and_stations.to_json(type="dict"),
+            "sm_obstacles": ui.input_sm_obstacles.to_json(type="dict"),
+            "buffer": ui.input_buffer.to_json(type="dict"),
+            "skycar_setup": ui.input_skycar_setup.to_json(type="dict"),
+            "tc_obstacles": ui.input_tc_obstacles.to_json(type="dict"),
+            "skycar_constraints": ui.input_skycar_constraints.to_json(type="dict"),
+            "autostore": ui.input_autostore.to_json(type="dict"),
+            "database": ui.input_database.to_json(type="dict"),
+        }
+
+    @staticmethod
+    def _run_concurrently(
+        step_groups: List[List[Tuple[str, Callable]]],
+    ) -> Iterator[str]:
+        """
+        Run groups of steps concurrently, with the steps of each group run in order.
+        Streamlit elements can only be updated from the main thread, so the names of the
+        completed steps are yielded back to it as they finish.
+
+        Parameters
+        ----------
+        step_groups : List[List[Tuple[str, Callable]]]
+            The groups of steps, where each step is given by its name and its function.
+
+        Yields
+        ------
+        str
+            The name of each step once it has completed.
+
+        Raises
+        ------
+        Exception
+            The first exception raised by a step. The group of the failed step stops,
+            while the other groups are left to finish.
+        """
+        completed_steps = queue.Queue()
+
+        def run_step_group(step_group: List[Tuple[str, Callable]]):
+            try:
+                for step_name, step_func in step_group:
+                    _ = step_func()
+                    completed_steps.put((step_name, None))
+            except Exception as e:
+                completed_steps.put((None, e))
+
+        with ThreadPoolExecutor(max_workers=len(step_groups)) as executor:
+            for step_group in step_groups:
+                executor.submit(run_step_group, step_group)
+
+            remaining_steps = sum(len(step_group) for step_group in step_groups)
+            while remaining_steps > 0:
+                step_name, error = completed_steps.get()
+                if error is not None:
+                    raise error
+                remaining_steps -= 1
+                yield step_name
+
     def _set_server(self):
         """
         Set the right base URL for the server.
@@ -109,6 +245,8 @@ class Simulator:
         """
         response = MosaicRequest.send_request(
             url=f"{self.SM_BASE}/v3/initialize/reset",
+            timeout=STEP_TIMEOUT,
+            session=self.session,
         )
         return response
 
@@ -123,9 +261,9 @@ class Simulator:
         """
         response = MosaicRequest.send_request(
             url=f"{self.SM_BASE}/v3/initialize",
-            data=self.simulation_preparation_ui.input_zones_and_stations.to_json(
-                type="dict"
-            ),
+            data=self.payloads["zones_and_stations"],
+            timeout=STEP_TIMEOUT,
+            session=self.session,
         )
         return response
 
@@ -140,7 +278,9 @@ class Simulator:
         """
         response = MosaicRequest.send_request(
             url=f"{self.SM_BASE}/v3/obstacles",
-            data=self.simulation_preparation_ui.input_sm_obstacles.to_json(type="dict"),
+            data=self.payloads["sm_obstacles"],
+            timeout=STEP_TIMEOUT,
+            session=self.session,
         )
         return response
 
@@ -155,7 +295,9 @@ class Simulator:
         """
         response = MosaicRequest.send_request(
             url=f"{self.SM_BASE}/v3/initialize/storage",
-            data=self.simulation_preparation_ui.input_buffer.to_json(type="dict"),
+            data=self.payloads["buffer"],
+            timeout=STEP_TIMEOUT,
+            session=self.session,
         )
         return response
 
@@ -170,7 +312,9 @@ class Simulator:
         """
         response = MosaicRequest.send_request(
             url=f"{self.TC_BASE}/simulation/seed-skycars",
-            data=self.simulation_preparation_ui.input_skycar_setup.to_json(type="dict"),
+            data=self.payloads["skycar_setup"],
+            timeout=STEP_TIMEOUT,
+            session=self.session,
         )
         return response
 
@@ -185,7 +329,9 @@ class Simulator:
         """
         response = MosaicRequest.send_request(
             url=f"{self.TC_BASE}/wcs/obstacle",
-            data=self.simulation_preparation_ui.input_tc_obstacles.to_json(type="dict"),
+            data=self.payloads["tc_obstacles"],
+            timeout=STEP_TIMEOUT,
+            session=self.session,
         )
         return response
 
@@ -200,10 +346,10 @@ class Simulator:
         """
         response = MosaicRequest.send_request(
             url=f"{self.TC_BASE}/operation/cube/constraints",
-            data=self.simulation_preparation_ui.input_skycar_constraints.to_json(
-                type="dict"
-            ),
+            data=self.payloads["skycar_constraints"],
             method="PATCH",
+            timeout=STEP_TIMEOUT,
+            session=self.session,
         )
         return response
 
@@ -218,6 +364,8 @@ class Simulator:
         """
         response = MosaicRequest.send_request(
             url=f"{self.TC_BASE}/operation/cube?start=true&bypass=true",
+            timeout=STEP_TIMEOUT,
+            session=self.session,
         )
         return response
 
@@ -233,7 +381,9 @@ class Simulator:
         response = MosaicRequest.send_request(
             url=f"{self.SM_BASE}/v3/settings/auto-store",
             method="PUT",
-            data=self.simulation_preparation_ui.input_autostore.to_json(type="dict"),
+            data=self.payloads["autostore"],
+            timeout=STEP_TIMEOUT,
+            session=self.session,
         )
         return response
 
@@ -246,12 +396,10 @@ class Simulator:
         requests.Response
             The response from simulation backend.
         """
-        simulation_database = SimulationDatabase()
-        simulation_run_id = simulation_database.add_simulation_run(
+        simulation_run_id = self.simulation_database.add_simulation_run(
             name=self.simulation_preparation_ui.input_simulation.configuration.name,
             server_number=self.simulation_preparation_ui.server_number,
         )
-        simulation_database.close_connection()
 
         self.simulation_preparation_ui.input_simulation.update_simulation_run_id(
             simulation_run_id=simulation_run_id
@@ -261,6 +409,8 @@ class Simulator:
             url=f"{self.SIMULATION_BASE}/jobs/create",
             method="POST",
             data=self.simulation_preparation_ui.input_simulation.to_json(type="dict"),
+            timeout=STEP_TIMEOUT,
+            session=self.session,
         )
         return response
 
@@ -268,14 +418,10 @@ class Simulator:
         """
         Save simulation parameters to the database.
         """
-        simulation_database = SimulationDatabase()
         simulation_run_id = (
             self.simulation_preparation_ui.input_simulation.configuration.id
         )
-        simulation_database.add_simulation_parameters(
+        self.simulation_database.add_simulation_parameters(
             simulation_run_id=simulation_run_id,
-            parameters=self.simulation_preparation_ui.input_database.to_json(
-                type="dict"
-            ),
+            parameters=self.payloads["database"],
         )
-        simulation_database.close_connection()
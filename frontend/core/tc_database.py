@@ -1,4 +1,9 @@
+import atexit
+import threading
+
 import pandas
+import pyarrow
+import pyarrow.compute as pc
 from core.config import (
     MONGO_HOST_1,
     MONGO_HOST_2,
@@ -11,6 +16,42 @@ from core.exception import SimulationFrontendException
 from pymongo import MongoClient
 
 
+# Number of documents fetched from MongoDB per round trip.
+MESSAGE_BATCH_SIZE = 10_000
+
+# Pattern to extract the action and the coordinates to go from a skycar message, with
+# the main entries ("LOG,...") and the child entries ("SC,...") in separate groups.
+MESSAGE_PATTERN = (
+    r"^(?:LOG,(?:[^,]*,){5}(?P<main_action>[^,]*),[^,]*,"
+    r"(?P<main_x>-?\d+),(?P<main_y>-?\d+)"
+    r"|(?:[^,]*,){4}(?P<child_action>[^,]*),[^,]*,"
+    r"(?P<child_x>-?\d+),(?P<child_y>-?\d+))"
+)
+
+# MongoDB clients shared by all MongoService instances of the process, keyed by the
+# connection settings. A client is thread-safe and keeps its own connection pool, so
+# reusing it skips the server discovery and authentication of a new client.
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def _close_clients():
+    """
+    Close the shared MongoDB clients when the process exits.
+    """
+    with _clients_lock:
+        for client in _clients.values():
+            try:
+                client.close()
+
+            except Exception as e:
+                print(f"Error closing MongoDB connection: {e}")
+        _clients.clear()
+
+
+atexit.register(_close_clients)
+
+
 class MongoService:
     """
     Class related to interacting with TC MongoDB database.
@@ -40,27 +81,37 @@ class MongoService:
 
     def _get_client(self) -> MongoClient:
         """
-        Get the MongoDB client.
+        Get the MongoDB client, shared with the other instances that use the same
+        connection settings.
 
         Returns
         -------
         MongoClient
             The MongoDB client.
         """
-        client = MongoClient(
-            host=self.host,
-            username=self.username,
-            password=self.password,
-            replicaset=self.replica_set,
-            serverSelectionTimeoutMS=1500,
-        )
+        key = (self.host, self.username, self.password, self.replica_set)
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = MongoClient(
+                    host=self.host,
+                    username=self.username,
+                    password=self.password,
+                    replicaset=self.replica_set,
+                    serverSelectionTimeoutMS=1500,
+                    maxPoolSize=20,
+                    minPoolSize=2,
+                    appname="simulation-dashboard",
+                )
+                _clients[key] = client
         return client
 
-    def get_skycar_messages(
+    def _read_skycar_messages(
         self, start_timestamp: float, end_timestamp: float
-    ) -> pandas.DataFrame:
+    ) -> pyarrow.Table:
         """
-        Get raw skycar messages from the TC database.
+        Read raw skycar messages from the TC database into a PyArrow table, built once
+        from the columns of the fetched documents.
 
         Parameters
         ----------
@@ -71,8 +122,8 @@ class MongoService:
 
         Returns
         -------
-        pandas.DataFrame
-            A pandas DataFrame containing the skycar messages.
+        pyarrow.Table
+            A PyArrow table containing the skycar messages.
 
         Raises
         ------
@@ -80,8 +131,6 @@ class MongoService:
             If there is an error connecting to the MongoDB database.
         """
         try:
-            self.client.server_info()
-
             collection = self.client[self.name]["skycar_message"]
             result = collection.aggregate(
                 [
@@ -115,16 +164,54 @@ class MongoService:
                             "completed_at": "$created_at",
                         }
                     },
-                ]
+                ],
+                batchSize=MESSAGE_BATCH_SIZE,
+                allowDiskUse=True,
             )
 
-            df = pandas.DataFrame(result)
+            skycar_ids, messages, completed_ats = [], [], []
+            for document in result:
+                skycar_ids.append(document["skycar_id"])
+                messages.append(document["message"])
+                completed_ats.append(document["completed_at"])
+
+            table = pyarrow.table(
+                {
+                    "skycar_id": pyarrow.array(skycar_ids),
+                    "message": pyarrow.array(messages, type=pyarrow.string()),
+                    "completed_at": pyarrow.array(completed_ats),
+                }
+            )
 
-            return df
+            return table
 
         except Exception as e:
             raise SimulationFrontendException(f"Error connecting to MongoDB: {e}")
 
+    def get_skycar_messages(
+        self, start_timestamp: float, end_timestamp: float
+    ) -> pandas.DataFrame:
+        """
+        Get raw skycar messages from the TC database.
+
+        Parameters
+        ----------
+        start_timestamp : float
+            The start timestamp of the time range to get the skycar messages from.
+        end_timestamp : float
+            The end timestamp of the time range to get the skycar messages from.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A pandas DataFrame containing the skycar messages, with Arrow backed
+            columns.
+        """
+        table = self._read_skycar_messages(
+            start_timestamp=start_timestamp, end_timestamp=end_timestamp
+        )
+        return table.to_pandas(types_mapper=pandas.ArrowDtype)
+
     def get_movement_data(
         self,
         start_timestamp: float,
@@ -149,22 +236,14 @@ class MongoService:
         pandas.DataFrame
             A processedpandas DataFrame containing the skycar movement data.
         """
-        df = self.get_skycar_messages(
+        table = self._read_skycar_messages(
             start_timestamp=start_timestamp, end_timestamp=end_timestamp
         )
 
-        # Convert skycar_id from stringto integer
-        df["skycar_id"] = df["skycar_id"].astype(int)
-
-        # Split the message into a list of strings
-        split = df["message"].str.split(",")
-
         # There are two kinds of entries: main (prefixed with 'LOG') and child (prefixed
         # with 'SC'). Main entries contain the information of the whole linear leg of
         # the skycar. Child entries break down the main entries into smaller individual
-        # coordinates. Here, we identify the main entries.
-        main_mask = split.str[0] == "LOG"
-
+        # coordinates.
         # An example main entry is "LOG,SC,1,I,S1-19623ee623e0000,3,B,x,18,19,0,,CB,".
         # Here, from the 6th element (index 5):
         # - index 5: number of child entries (or steps).
@@ -174,64 +253,72 @@ class MongoService:
         # - index 7: axis (x, y).
         # - index 8: x coordinate to go.
         # - index 9: y coordinate to go.
-        # if is_for_movement_visualisation:
-        #     df = df.loc[~main_mask, :]
-        # else:
-        df.loc[main_mask, "x"] = split.loc[main_mask].str[8].astype(int)
-        df.loc[main_mask, "y"] = split.loc[main_mask].str[9].astype(int)
-        df.loc[main_mask, "action"] = "LOG" + split.loc[main_mask].str[6]
-
-        # For child entries, we extract the action and the coordinates to go.
+        # For child entries, we extract the action (index 4) and the coordinates to go
+        # (index 6 and 7).
         # An example child entry is "SC,1,I,S1-19623ee8d780000-1,B,y,18,13,0,,100"
-        df.loc[~main_mask, "action"] = split.loc[~main_mask].str[4]
-        df.loc[~main_mask, "x"] = split.loc[~main_mask].str[6].astype(int)
-        df.loc[~main_mask, "y"] = split.loc[~main_mask].str[7].astype(int)
+        # All of them are extracted in a single pass over the messages, where the groups
+        # of the other kind of entry are left empty.
+        fields = pc.extract_regex(table["message"], MESSAGE_PATTERN)
+
+        # Here, we identify the main entries.
+        is_main = pc.not_equal(pc.struct_field(fields, "main_x"), "")
+
+        action = pc.if_else(
+            is_main,
+            pc.binary_join_element_wise(
+                "LOG", pc.struct_field(fields, "main_action"), ""
+            ),
+            pc.struct_field(fields, "child_action"),
+        )
+        x = pc.if_else(
+            is_main,
+            pc.struct_field(fields, "main_x"),
+            pc.struct_field(fields, "child_x"),
+        )
+        y = pc.if_else(
+            is_main,
+            pc.struct_field(fields, "main_y"),
+            pc.struct_field(fields, "child_y"),
+        )
+
+        # Convert skycar_id from string to integer. The skycar IDs and the grid
+        # coordinates fit in 16 bits, and the few distinct actions are kept as a
+        # categorical column.
+        df = pyarrow.table(
+            {
+                "skycar_id": pc.cast(table["skycar_id"], pyarrow.int16()),
+                "completed_at": table["completed_at"],
+                "x": pc.cast(x, pyarrow.int16()),
+                "y": pc.cast(y, pyarrow.int16()),
+                "action": pc.dictionary_encode(action),
+            }
+        ).to_pandas()
+        main_mask = pandas.Series(is_main.to_numpy(), index=df.index)
 
         df = df.sort_values(by=["skycar_id", "completed_at"])
         simulation_start_timestamp = df["completed_at"].min()
 
         # For the time of beginning of an entry, we just take the shift of the whole
         # dataset of a given skycar_id because LOG entries are the time when the
-        # instruction is received.
+        # instruction is received. As the entries are sorted by skycar_id, this is the
+        # previous row, unless the row is the first entry of its skycar_id.
         # For the very first entry of a given skycar_id, we assume that the message was
         # received at the start of the simulation, minus 1 second as buffer.
-        df["begin_at"] = df.groupby("skycar_id")["completed_at"].shift(1)
-        df.loc[df["begin_at"].isna(), "begin_at"] = simulation_start_timestamp - 1
+        is_first_entry = df["skycar_id"].ne(df["skycar_id"].shift(1))
+        df["begin_at"] = df["completed_at"].shift(1).mask(is_first_entry)
+        df["begin_at"] = df["begin_at"].fillna(simulation_start_timestamp - 1)
 
         # To get the previous coordinates, we need to separate the main entries and the
-        # child entries, then shift the coordinates of the previous entry.
-        df.loc[~main_mask, "prev_x"] = (
-            df.loc[~main_mask].groupby("skycar_id")["x"].shift(1)
-        )
-        df.loc[~main_mask, "prev_y"] = (
-            df.loc[~main_mask].groupby("skycar_id")["y"].shift(1)
-        )
-
-        df.loc[main_mask, "prev_x"] = (
-            df.loc[main_mask].groupby("skycar_id")["x"].shift(1)
-        )
-        df.loc[main_mask, "prev_y"] = (
-            df.loc[main_mask].groupby("skycar_id")["y"].shift(1)
-        )
-
-        # Also for previous coordinates, we assume first entry is the same as the current
-        # coordinates.
-        df.loc[(~main_mask) & df["prev_x"].isna(), "prev_x"] = df.loc[
-            (~main_mask) & df["prev_x"].isna(), "x"
-        ]
-        df.loc[(~main_mask) & df["prev_y"].isna(), "prev_y"] = df.loc[
-            (~main_mask) & df["prev_y"].isna(), "y"
-        ]
-
-        df.loc[main_mask & df["prev_x"].isna(), "prev_x"] = df.loc[
-            main_mask & df["prev_x"].isna(), "x"
-        ]
-        df.loc[main_mask & df["prev_y"].isna(), "prev_y"] = df.loc[
-            (main_mask) & df["prev_y"].isna(), "y"
-        ]
-
-        # Drop the message column
-        df = df.drop(columns=["message"])
+        # child entries, then shift the coordinates of the previous entry. Both kinds
+        # are shifted in one pass by grouping on the skycar_id and the kind of entry.
+        # Also for previous coordinates, we assume first entry is the same as the
+        # current coordinates.
+        previous = df.groupby([df["skycar_id"], main_mask], sort=False)[
+            ["x", "y"]
+        ].shift(1)
+        df["prev_x"] = previous["x"].fillna(df["x"])
+        df["prev_y"] = previous["y"].fillna(df["y"])
+        df = df.astype({"prev_x": "int16", "prev_y": "int16"})
 
         if save_filename is not None and isinstance(save_filename, str):
             df.to_csv(save_filename, index=False)
@@ -240,11 +327,7 @@ class MongoService:
 
     def close_connection(self):
         """
-        Close the MongoDB connection.
+        Release the MongoDB connection. The shared client is left open for the other
+        instances, and is closed when the process exits.
         """
-        try:
-            if hasattr(self, "client") and self.client:
-                self.client.close()
-
-        except Exception as e:
-            print(f"Error closing MongoDB connection: {e}")
+        self.client = None
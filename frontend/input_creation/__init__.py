@@ -4,4 +4,5 @@ from .input_sm_obstacles import InputSMObstacles
 from .input_tc_obstacles import InputTCObstacles
 from .input_buffer import InputBuffer
 from .input_autostore import InputAutostore
+from .input_simulation import InputSimulation
 from .input_database import InputDatabase
@@ -1,9 +1,11 @@
-import json
+import math
 
+from core.exception import SimulationFrontendException
 from core.parameters import Parameters
+from input_creation.serialisation import JsonSerialisable
 
 
-class InputBuffer:
+class InputBuffer(JsonSerialisable):
     """
     Class to create the buffer from the grid designer UI buffer ratio, then to send to SM.
 
@@ -12,42 +14,34 @@ class InputBuffer:
     buffer_ratio : float
         The buffer ratio after taking into account the grid and also the number of bins
         expected.
+
+    Raises
+    ------
+    SimulationFrontendException
+        If the buffer ratio is missing or not a finite number.
     """
 
+    FILENAME = "reset-4.json"
+
     def __init__(self, buffer_ratio: float):
+        if buffer_ratio is None or not math.isfinite(buffer_ratio):
+            raise SimulationFrontendException(
+                f"Buffer ratio must be a finite number, got {buffer_ratio}"
+            )
+
         # This percentage is the percentage of the grid that is expected to be filled.
         self.percentage = round(max(0.0, min(1 - buffer_ratio, 1.0)), 2)
         self.zoneGroup = Parameters.ZONE_NAME
 
-    def to_json(
-        self, save: bool = False, filename: str = "reset-4.json", type: str = "str"
-    ) -> str:
+    def to_dict(self) -> dict:
         """
-        Convert the buffer to a JSON string.
-
-        Parameters
-        ----------
-        save : bool, optional
-            Whether to save the JSON string to a file, by default False
-        filename : str, optional
-            The name of the file to save the JSON string to, by default "reset-4.json"
-        type : str, optional
-            The type of the input; either "str" or "dict", by default "str".
+        Convert the buffer to a dictionary, without going through a JSON string. A new
+        dictionary is built on every call, so that changes to it by the caller do not
+        leak into the buffer.
 
         Returns
         -------
-        str
-            The JSON string of the buffer.
+        dict
+            The dictionary of the buffer.
         """
-        json_str = json.dumps(
-            self, default=lambda o: o.__dict__, sort_keys=True, indent=4
-        )
-
-        if save:
-            with open(filename, "w") as file:
-                file.write(json_str)
-
-        if type == "str":
-            return json_str
-        elif type == "dict":
-            return json.loads(json_str)
+        return {"percentage": self.percentage, "zoneGroup": self.zoneGroup}
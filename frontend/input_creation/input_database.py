@@ -1,14 +1,13 @@
-import json
-
 from input_creation.input_simulation import InputSimulation
 from ui_components.grid_designer import GridDesignerUI
 from ui_components.simulation_input import SimulationInputUI
 
 from core.exception import SimulationFrontendException
 from input_creation.input_zones_stations import InputZonesAndStations
+from input_creation.serialisation import JsonSerialisable
 
 
-class InputDatabase:
+class InputDatabase(JsonSerialisable):
     """
     Class to save the information to store in simulation database.
 
@@ -24,6 +23,8 @@ class InputDatabase:
         The input simulation class.
     """
 
+    FILENAME = "reset-database.json"
+
     def __init__(
         self,
         simulation_input_ui: SimulationInputUI,
@@ -72,10 +73,17 @@ class InputDatabase:
             The encoded desired skycar directions. Arrow segments are separated by
             semicolons. Each segment is of the format "arrow_index:X,Y".
         """
-        return_str = ""
-        for _, row in grid_designer_ui.desired_skycar_directions.iterrows():
-            return_str += f"{row['arrow_index']}:{row['X']},{row['Y']};"
-        return return_str[:-1]
+        # The values are taken from the whole frame at once, so they share one dtype as
+        # with rows from iterrows.
+        desired_skycar_directions = grid_designer_ui.desired_skycar_directions
+        values = desired_skycar_directions.to_numpy()
+        columns = [
+            desired_skycar_directions.columns.get_loc(column)
+            for column in ["arrow_index", "X", "Y"]
+        ]
+        return ";".join(
+            f"{arrow_index}:{x},{y}" for arrow_index, x, y in values[:, columns]
+        )
 
     def _encode_station_groups(self, input_simulation: InputSimulation) -> str:
         """
@@ -92,14 +100,10 @@ class InputDatabase:
             The encoded station groups. Each group is of the format
             "group_index:{code1},{code2},...". Groups are separated by semicolons.
         """
-        return_str = ""
-        for group in input_simulation.station_groups:
-            return_str += (
-                f"{group.group}:"
-                + ",".join(str(code) for code in group.station_codes)
-                + ";"
-            )
-        return return_str[:-1]
+        return ";".join(
+            f"{group.group}:" + ",".join(map(str, group.station_codes))
+            for group in input_simulation.station_groups
+        )
 
     def _encode_stations(
         self,
@@ -125,80 +129,63 @@ class InputDatabase:
 
         Raises
         ------
-        ValueError
-            _description_
+        SimulationFrontendException
+            If a station in the zones and stations has no type in the simulation input.
         """
         # Get stations from both inputs
         stations_from_input_zones_and_stations = input_zones_and_stations.stations
         stations_from_input_simulation = input_simulation.stations
 
+        # Station types by code. The list is reversed so that the first station of a
+        # code is kept, if a code is listed more than once.
+        station_types = {
+            station.code: station.type
+            for station in reversed(stations_from_input_simulation)
+        }
+
         # Build station strings
         station_segments = []
         for station_item in stations_from_input_zones_and_stations:
             code = station_item.code
-            station_type = next(
-                (x.type for x in stations_from_input_simulation if x.code == code),
-                None,
-            )
+            station_type = station_types.get(code)
 
             if station_type is None:
                 raise SimulationFrontendException(
                     f"Station type not found for code: {code}"
                 )
 
-            # Get coordinates
-            drop_coords = (
-                station_item.drop[0].coordinate.x,
-                station_item.drop[0].coordinate.y,
-            )
-            pick_coords = (
-                station_item.pick[0].coordinate.x,
-                station_item.pick[0].coordinate.y,
-            )
-
-            # Format the station string
-            station_str = (
-                f"{code}{station_type}:"
-                f"D(x{drop_coords[0]}y{drop_coords[1]})"
-                f"P(x{pick_coords[0]}y{pick_coords[1]})"
+            drop = station_item.drop[0].coordinate
+            pick = station_item.pick[0].coordinate
+            station_segments.append(
+                f"{code}{station_type}:D(x{drop.x}y{drop.y})P(x{pick.x}y{pick.y})"
             )
-            station_segments.append(station_str)
 
         # Join all station segments with semicolons
         return ";".join(station_segments)
 
-    def to_json(
-        self,
-        save: bool = False,
-        filename: str = "reset-database.json",
-        type: str = "str",
-    ) -> str:
+    def to_dict(self) -> dict:
         """
-        Convert the input database to a JSON string.
-
-        Parameters
-        ----------
-        save : bool, optional
-            Whether to save the JSON string to a file, by default False
-        filename : str, optional
-            The name of the file to save the JSON string to, by default "reset-database.json"
-        type : str, optional
-            The type of the input; either "str" or "dict", by default "str"
+        Convert the input database to a dictionary.
 
         Returns
         -------
-        str
-            The JSON string of the input database.
+        dict
+            The dictionary of the input database.
         """
-        json_str = json.dumps(
-            self, default=lambda o: o.__dict__, sort_keys=True, indent=4
-        )
-
-        if save:
-            with open(filename, "w") as file:
-                file.write(json_str)
-
-        if type == "str":
-            return json_str
-        elif type == "dict":
-            return json.loads(json_str)
+        return {
+            "simulation_name": self.simulation_name,
+            "inbound_bins_per_order": self.inbound_bins_per_order,
+            "outbound_bins_per_order": self.outbound_bins_per_order,
+            "inbound_orders_per_hour": self.inbound_orders_per_hour,
+            "outbound_orders_per_hour": self.outbound_orders_per_hour,
+            "number_of_skycars": self.number_of_skycars,
+            "inbound_handling_time": self.inbound_handling_time,
+            "outbound_handling_time": self.outbound_handling_time,
+            "pareto_p": self.pareto_p,
+            "pareto_q": self.pareto_q,
+            "number_of_bins": self.number_of_bins,
+            "stations_string": self.stations_string,
+            "duration_string": self.duration_string,
+            "station_groups_string": self.station_groups_string,
+            "desired_skycar_directions_string": self.desired_skycar_directions_string,
+        }
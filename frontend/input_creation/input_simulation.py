@@ -1,12 +1,17 @@
-import json
+import re
 from typing import List
 
 from ui_components.simulation_input import SimulationInputUI
 from ui_components.grid_designer import GridDesignerUI
 from core.exception import SimulationFrontendException
+from input_creation.serialisation import JsonSerialisable
 
+# Pattern of the station code in a station cell, e.g. 12 in "P12DI". The format of the
+# station cells is validated by the grid designer UI.
+STATION_CODE_PATTERN = re.compile(r"\d+")
 
-class InputSimulation:
+
+class InputSimulation(JsonSerialisable):
     """
     Create the simulation input.
 
@@ -20,6 +25,8 @@ class InputSimulation:
         The server number.
     """
 
+    FILENAME = "reset-simulation.json"
+
     def __init__(
         self,
         simulation_input_ui: SimulationInputUI,
@@ -84,8 +91,9 @@ class InputSimulation:
             The grid designer UI.
         """
         stations: List[InputStation] = []
+        seen_stations = set()
         for grid_station in grid_designer_ui.station_cells:
-            code = int("".join(filter(str.isdigit, grid_station)))
+            code = int(STATION_CODE_PATTERN.search(grid_station).group())
             last_character = grid_station[-1]
             if last_character not in ["I", "O"]:
                 raise SimulationFrontendException(
@@ -93,12 +101,10 @@ class InputSimulation:
                 )
 
             # Check if the station code is already in the list to avoid duplicates
-            if any(
-                station.code == code and station.type == last_character
-                for station in stations
-            ):
+            if (code, last_character) in seen_stations:
                 continue
 
+            seen_stations.add((code, last_character))
             stations.append(InputStation(code=code, type_=last_character))
 
         self.stations = stations
@@ -128,43 +134,21 @@ class InputSimulation:
         """
         self.configuration.id = simulation_run_id
 
-    def to_json(
-        self,
-        save: bool = False,
-        filename: str = "reset-simulation.json",
-        type: str = "str",
-    ) -> str:
+    def to_dict(self) -> dict:
         """
-        Convert the simulation input to a JSON string.
-
-        Parameters
-        ----------
-        save : bool, optional
-            Whether to save the JSON string to a file, by default False
-        filename : str, optional
-            The name of the file to save the JSON string to, by default "reset-simulation.json"
-        type : str, optional
-            The type of the input; either "str" or "dict", by default "str"
+        Convert the simulation input to a dictionary.
 
         Returns
         -------
-        str
-            The JSON string of the input.
+        dict
+            The dictionary of the simulation input.
         """
-        json_str = json.dumps(
-            self, default=lambda o: o.__dict__, sort_keys=True, indent=4
-        )
-
-        if save:
-            with open(filename, "w") as file:
-                file.write(json_str)
-
-        if type == "str":
-            return json_str
-        elif type == "dict":
-            return json.loads(json_str)
-
-
+        return {
+            "parameters": self.parameters.to_dict(),
+            "configuration": self.configuration.to_dict(),
+            "stations": [station.to_dict() for station in self.stations],
+            "station_groups": [group.to_dict() for group in self.station_groups],
+        }
 
 
 class InputParameters:
@@ -188,6 +172,16 @@ class InputParameters:
     pareto_probabilities : List[float]
         The Pareto probabilities from grid designer UI.
     """
+    __slots__ = (
+        "inbound_time",
+        "outbound_time",
+        "inbound_bins_per_order",
+        "outbound_bins_per_order",
+        "inbound_orders_per_hour",
+        "outbound_orders_per_hour",
+        "pareto_probabilities",
+    )
+
     def __init__(
         self,
         inbound_time: int,
@@ -206,6 +200,25 @@ class InputParameters:
         self.outbound_orders_per_hour = outbound_orders_per_hour
         self.pareto_probabilities = pareto_probabilities
 
+    def to_dict(self) -> dict:
+        """
+        Convert the simulation parameters to a dictionary.
+
+        Returns
+        -------
+        dict
+            The dictionary of the simulation parameters.
+        """
+        return {
+            "inbound_time": self.inbound_time,
+            "outbound_time": self.outbound_time,
+            "inbound_bins_per_order": self.inbound_bins_per_order,
+            "outbound_bins_per_order": self.outbound_bins_per_order,
+            "inbound_orders_per_hour": self.inbound_orders_per_hour,
+            "outbound_orders_per_hour": self.outbound_orders_per_hour,
+            "pareto_probabilities": self.pareto_probabilities,
+        }
+
 
 class InputConfiguration:
     """
@@ -220,6 +233,8 @@ class InputConfiguration:
     duration_string : str
         The string that stores the operation durations. Example is N1800;AO700.
     """
+    __slots__ = ("name", "server_number", "duration_string", "id")
+
     def __init__(
         self,
         name: str,
@@ -233,6 +248,22 @@ class InputConfiguration:
         # To be updated by the database
         self.id = None
 
+    def to_dict(self) -> dict:
+        """
+        Convert the simulation configuration to a dictionary.
+
+        Returns
+        -------
+        dict
+            The dictionary of the simulation configuration.
+        """
+        return {
+            "name": self.name,
+            "server_number": self.server_number,
+            "duration_string": self.duration_string,
+            "id": self.id,
+        }
+
 
 class InputStation:
     """
@@ -245,10 +276,23 @@ class InputStation:
     type_ : str
         The station type. Can be "I" for inbound or "O" for outbound.
     """
+    __slots__ = ("code", "type")
+
     def __init__(self, code: int, type_: str):
         self.code = code
         self.type = type_
 
+    def to_dict(self) -> dict:
+        """
+        Convert the station information to a dictionary.
+
+        Returns
+        -------
+        dict
+            The dictionary of the station information.
+        """
+        return {"code": self.code, "type": self.type}
+
 
 class InputStationGroup:
     """
@@ -261,6 +305,19 @@ class InputStationGroup:
     station_codes : List[int]
         The station codes in the group.
     """
+    __slots__ = ("group", "station_codes")
+
     def __init__(self, group: int, station_codes: List[int]):
         self.group = group
         self.station_codes = station_codes
+
+    def to_dict(self) -> dict:
+        """
+        Convert the station group information to a dictionary.
+
+        Returns
+        -------
+        dict
+            The dictionary of the station group information.
+        """
+        return {"group": self.group, "station_codes": self.station_codes}
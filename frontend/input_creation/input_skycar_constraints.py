@@ -1,10 +1,30 @@
-import json
 from typing import List
 
+import numpy
+from input_creation.serialisation import JsonSerialisable
 from ui_components.grid_designer import GridDesignerUI
 
-
-class InputSkyCarConstraints:
+# Offsets from a constraint of a coordinate to itself, [x, y, x, y], to the eight
+# constraints of the coordinate: to each of the four neighbouring coordinates, then
+# from each of them.
+OFFSETS = numpy.array(
+    [
+        [1, 0, 0, 0],
+        [-1, 0, 0, 0],
+        [0, 1, 0, 0],
+        [0, -1, 0, 0],
+        [0, 0, 1, 0],
+        [0, 0, -1, 0],
+        [0, 0, 0, 1],
+        [0, 0, 0, -1],
+    ]
+)
+
+# Offset added to the coordinates of a constraint when it is packed into an integer.
+COORDINATE_OFFSET = 1
+
+
+class InputSkyCarConstraints(JsonSerialisable):
     """
     Create the skycar constraints from the grid designer UI, then to send to TC.
 
@@ -14,6 +34,8 @@ class InputSkyCarConstraints:
         The grid designer UI.
     """
 
+    FILENAME = "reset-constraints.json"
+
     def __init__(self, grid_designer_ui: GridDesignerUI):
         self.constraints = self._create_constraints(grid_designer_ui=grid_designer_ui)
 
@@ -40,115 +62,106 @@ class InputSkyCarConstraints:
         if grid_designer_ui.desired_skycar_directions is None:
             return []
 
-        constraints = []
-        constraints_to_remove = []
-        # Constraints for each arrow
-        for _, arrow_points in grid_designer_ui.desired_skycar_directions.groupby(
-            "arrow_index"
-        ):
-            arrow_points = arrow_points.drop(columns=["arrow_index"])
-            current_arrow_constraints = []
-            current_constraints_to_remove = []
-            for i in range(len(arrow_points) - 1):
-                turning_point_i = (
-                    arrow_points.iloc[i]["X"] - 1,
-                    arrow_points.iloc[i]["Y"] - 1,
-                )
-                turning_point_j = (
-                    arrow_points.iloc[i + 1]["X"] - 1,
-                    arrow_points.iloc[i + 1]["Y"] - 1,
-                )
-
-                # Calculate the unit vector of the arrow segment
-                length = max(
-                    abs(turning_point_j[0] - turning_point_i[0]),
-                    abs(turning_point_j[1] - turning_point_i[1]),
-                )
-                unit_vector = (
-                    int((turning_point_j[0] - turning_point_i[0]) / length),
-                    int((turning_point_j[1] - turning_point_i[1]) / length),
-                )
-
-                for step in range(1, length + 1):
-                    # Skip for the last turning point (end) of the arrow
-                    if i == len(arrow_points) - 2 and step == length:
-                        constraint_to_remove = turning_point_j + (
-                            turning_point_j[0] - unit_vector[0],
-                            turning_point_j[1] - unit_vector[1],
-                        )
-                        current_constraints_to_remove.append(constraint_to_remove)
-                        break
-
-                    point = (
-                        turning_point_i[0] + step * unit_vector[0],
-                        turning_point_i[1] + step * unit_vector[1],
-                    )
-                    constraints_from_point = [
-                        (point[0] + 1, point[1]) + point,
-                        (point[0] - 1, point[1]) + point,
-                        (point[0], point[1] + 1) + point,
-                        (point[0], point[1] - 1) + point,
-                        point + (point[0] + 1, point[1]),
-                        point + (point[0] - 1, point[1]),
-                        point + (point[0], point[1] + 1),
-                        point + (point[0], point[1] - 1),
-                    ]
-
-                    # Remove the constrant that is the same direction as the arrow
-                    # segment
-                    constraint_to_remove = point + (
-                        point[0] - unit_vector[0],
-                        point[1] - unit_vector[1],
-                    )
-                    current_constraints_to_remove.append(constraint_to_remove)
-
-                    current_arrow_constraints.extend(constraints_from_point)
-
-            constraints.extend(current_arrow_constraints)
-            constraints_to_remove.extend(current_constraints_to_remove)
-
-        # Make sure no repeats in constraints and constraints_to_remove lists
-        constraints_set = set(constraints)
-        constraints_to_remove_set = set(constraints_to_remove)
-        constraints = list(constraints_set - constraints_to_remove_set)
-
-        # Convert contraints from tuple to list
-        constraints = sorted([list(constraint) for constraint in constraints])
-
-        return constraints
-
-    def to_json(
-        self,
-        save: bool = False,
-        filename: str = "reset-constraints.json",
-        type: str = "str",
-    ) -> str:
+        # Points of the arrows, with the points of each arrow kept together in order of
+        # entry. The coordinates are zero-indexed.
+        directions = grid_designer_ui.desired_skycar_directions.sort_values(
+            "arrow_index", kind="stable"
+        )
+        arrow_indices = directions["arrow_index"].to_numpy()
+        points = directions[["X", "Y"]].to_numpy().astype(numpy.int64) - 1
+
+        # Segments between consecutive points of the same arrow, and whether each one is
+        # the last segment of its arrow.
+        is_segment = arrow_indices[1:] == arrow_indices[:-1]
+        is_last_segment = is_segment & numpy.append(~is_segment[1:], True)
+        starts = points[:-1][is_segment]
+        vectors = points[1:][is_segment] - starts
+        is_last_segment = is_last_segment[is_segment]
+
+        # Calculate the unit vector of each arrow segment
+        lengths = numpy.abs(vectors).max(axis=1)
+        unit_vectors = numpy.trunc(vectors / lengths[:, None]).astype(numpy.int64)
+
+        # Every point stepped through along the segments, excluding the start point of
+        # each arrow.
+        segment_of_step = numpy.repeat(numpy.arange(len(lengths)), lengths)
+        steps = (
+            numpy.arange(lengths.sum())
+            - numpy.repeat(numpy.cumsum(lengths) - lengths, lengths)
+            + 1
+        )
+        step_unit_vectors = unit_vectors[segment_of_step]
+        step_points = starts[segment_of_step] + steps[:, None] * step_unit_vectors
+
+        # Remove the constraint that is the same direction as the arrow segment
+        constraints_to_remove = numpy.hstack(
+            [step_points, step_points - step_unit_vectors]
+        )
+
+        # All eight directions are constraints, except at the end of each arrow
+        is_end = is_last_segment[segment_of_step] & (steps == lengths[segment_of_step])
+        step_points = step_points[~is_end]
+        constraints = (numpy.tile(step_points, 2)[:, None, :] + OFFSETS).reshape(-1, 4)
+
+        # Make sure no repeats in constraints and constraints_to_remove lists.
+        # setdiff1d returns the constraints sorted, as the packing keeps their order.
+        constraints = numpy.setdiff1d(
+            self._pack(constraints), self._pack(constraints_to_remove)
+        )
+
+        return self._unpack(constraints).tolist()
+
+    @staticmethod
+    def _pack(constraints: numpy.ndarray) -> numpy.ndarray:
         """
-        Convert the skycar constraints to a JSON string.
+        Pack each constraint into a single integer, with 16 bits for each coordinate,
+        so that the constraints are compared and sorted as integers.
 
         Parameters
         ----------
-        save : bool, optional
-            Whether to save the JSON string to a file, by default False
-        filename : str, optional
-            The name of the file to save the JSON string to, by default "reset-constraints.json"
-        type : str, optional
-            The type of the input; either "str" or "dict", by default "str"
+        constraints : numpy.ndarray
+            The constraints, as rows of [{to_x}, {to_y}, {from_x}, {from_y}].
 
         Returns
         -------
-        str
-            The JSON string of the input.
+        numpy.ndarray
+            The packed constraints.
         """
-        json_str = json.dumps(
-            self, default=lambda o: o.__dict__, sort_keys=True, indent=4
+        # Coordinates next to the grid are -1, so they are shifted to be non-negative.
+        coordinates = (constraints + COORDINATE_OFFSET).astype(numpy.uint64)
+        return (
+            (coordinates[:, 0] << numpy.uint64(48))
+            | (coordinates[:, 1] << numpy.uint64(32))
+            | (coordinates[:, 2] << numpy.uint64(16))
+            | coordinates[:, 3]
         )
 
-        if save:
-            with open(filename, "w") as file:
-                file.write(json_str)
+    @staticmethod
+    def _unpack(packed: numpy.ndarray) -> numpy.ndarray:
+        """
+        Unpack the constraints packed by _pack.
+
+        Parameters
+        ----------
+        packed : numpy.ndarray
+            The packed constraints.
+
+        Returns
+        -------
+        numpy.ndarray
+            The constraints, as rows of [{to_x}, {to_y}, {from_x}, {from_y}].
+        """
+        shifts = numpy.array([48, 32, 16, 0], dtype=numpy.uint64)
+        coordinates = (packed[:, None] >> shifts) & numpy.uint64(0xFFFF)
+        return coordinates.astype(numpy.int64) - COORDINATE_OFFSET
+
+    def to_dict(self) -> dict:
+        """
+        Convert the skycar constraints to a dictionary.
 
-        if type == "str":
-            return json_str
-        elif type == "dict":
-            return json.loads(json_str)
+        Returns
+        -------
+        dict
+            The dictionary of the skycar constraints.
+        """
+        return {"constraints": self.constraints}
@@ -1,11 +1,10 @@
-import json
-
 import numpy
 from core.parameters import Parameters
+from input_creation.serialisation import JsonSerialisable
 from ui_components.grid_designer import GridDesignerUI
 
 
-class InputSMObstacles:
+class InputSMObstacles(JsonSerialisable):
     """
     Class to create the SM obstacles from the grid designer UI, then to send to SM. SM
     obstacles are stacks where bins cannot be stored.
@@ -16,6 +15,8 @@ class InputSMObstacles:
         The grid designer UI.
     """
 
+    FILENAME = "reset-3.json"
+
     def __init__(self, grid_designer_ui: GridDesignerUI):
         self._create_stacks(grid_designer_ui=grid_designer_ui)
         self.zoneGroup = Parameters.ZONE_NAME
@@ -31,63 +32,27 @@ class InputSMObstacles:
             The grid designer UI.
         """
         # Coordinates that are not free stacks nor stations are considered SM obstacles.
-        void_mask = ~(
-            grid_designer_ui.grid_data.map(lambda x: str(x).isdigit()).to_numpy()
-            | grid_designer_ui.grid_data.map(
-                lambda x: str(x).startswith("P")
-            ).to_numpy()
-        )
-        coordinates = numpy.argwhere(void_mask)
+        void_mask, _ = grid_designer_ui.obstacle_masks
 
-        # Create InputStack objects for each coordinate
-        self.stacks = [InputStack(x=int(col), y=int(row)) for row, col in coordinates]
+        # The coordinates of the stacks are kept as arrays rather than as one object
+        # per stack, in row-major order.
+        self.stack_ys, self.stack_xs = numpy.nonzero(void_mask)
 
-    def to_json(
-        self, save: bool = False, filename: str = "reset-3.json", type: str = "str"
-    ) -> str:
+    def to_dict(self) -> dict:
         """
-        Convert the SM obstacles to a JSON string.
-
-        Parameters
-        ----------
-        save : bool, optional
-            Whether to save the JSON string to a file, by default False
-        filename : str, optional
-            The name of the file to save the JSON string to, by default "reset-3.json"
-        type : str, optional
-            The type of the input; either "str" or "dict", by default "str".
+        Convert the SM obstacles to a dictionary.
 
         Returns
         -------
-        str
-            The JSON string of the input.
+        dict
+            The dictionary of the SM obstacles.
         """
-        json_str = json.dumps(
-            self, default=lambda o: o.__dict__, sort_keys=True, indent=4
-        )
-
-        if save:
-            with open(filename, "w") as file:
-                file.write(json_str)
-
-        if type == "str":
-            return json_str
-        elif type == "dict":
-            return json.loads(json_str)
-
-
-class InputStack:
-    """
-    Stack information to send to SM.
-
-    Parameters
-    ----------
-    x : int
-        The x coordinate of the stack.
-    y : int
-        The y coordinate of the stack.
-    """
+        return {
+            "stacks": [
+                {"x": x, "y": y}
+                for x, y in zip(self.stack_xs.tolist(), self.stack_ys.tolist())
+            ],
+            "zoneGroup": self.zoneGroup,
+            "isSkycarAccessible": self.isSkycarAccessible,
+        }
 
-    def __init__(self, x: int, y: int):
-        self.x = x
-        self.y = y
@@ -1,9 +1,9 @@
-import json
-
+import numpy
+from input_creation.serialisation import JsonSerialisable
 from ui_components.grid_designer import GridDesignerUI
 
 
-class InputTCObstacles:
+class InputTCObstacles(JsonSerialisable):
     """
     Class to create the TC obstacles from the grid designer UI, then to send to TC.
     TC obstacles are coordinates where skycars cannot access.
@@ -13,6 +13,9 @@ class InputTCObstacles:
     grid_designer_ui : GridDesignerUI
         The grid designer UI.
     """
+
+    FILENAME = "reset-6.json"
+
     def __init__(self, grid_designer_ui: GridDesignerUI):
         self.type = "Pillar"
         self.skycar_sid = 0
@@ -36,46 +39,24 @@ class InputTCObstacles:
         """
         # Coordinates that are not free stacks, stations, nor buffers are considered TC 
         # obstacles.
-        void_mask = ~(
-            grid_designer_ui.grid_data.map(lambda x: str(x).isdigit()).to_numpy()
-            | grid_designer_ui.grid_data.map(
-                lambda x: str(x).startswith("P")
-            ).to_numpy()
-            | grid_designer_ui.grid_data.map(lambda x: str(x) == "B").to_numpy()
-        )
+        _, void_mask = grid_designer_ui.obstacle_masks
 
-        rows, cols = void_mask.shape
-        return [f"{x},{y}" for y in range(rows) for x in range(cols) if void_mask[y, x]]
+        # Only the obstacle cells are visited, in row-major order.
+        ys, xs = numpy.nonzero(void_mask)
+        return [f"{x},{y}" for x, y in zip(xs.tolist(), ys.tolist())]
 
-    def to_json(
-        self, save: bool = False, filename: str = "reset-6.json", type: str = "str"
-    ) -> str:
+    def to_dict(self) -> dict:
         """
-        Convert the TC obstacles to a JSON string.
-
-        Parameters
-        ----------
-        save : bool, optional
-            Whether to save the JSON string to a file, by default False
-        filename : str, optional
-            The name of the file to save the JSON string to, by default "reset-6.json"
-        type : str, optional
-            The type of the input; either "str" or "dict", by default "str".
+        Convert the TC obstacles to a dictionary.
 
         Returns
         -------
-        str
-            The JSON string of the input.
+        dict
+            The dictionary of the TC obstacles.
         """
-        json_str = json.dumps(
-            self, default=lambda o: o.__dict__, sort_keys=True, indent=4
-        )
-
-        if save:
-            with open(filename, "w") as file:
-                file.write(json_str)
-
-        if type == "str":
-            return json_str
-        elif type == "dict":
-            return json.loads(json_str)
+        return {
+            "type": self.type,
+            "skycar_sid": self.skycar_sid,
+            "error_id": self.error_id,
+            "two_d": self.two_d,
+        }
@@ -1,15 +1,16 @@
 from __future__ import annotations
 
-import json
-from typing import List
+from functools import cached_property
+from typing import Dict, List
 
 import numpy
 from core.exception import SimulationFrontendException
 from core.parameters import Parameters
-from ui_components.grid_designer import GridDesignerUI
+from input_creation.serialisation import JsonSerialisable
+from ui_components.grid_designer import STATION_CELL_PATTERN, GridDesignerUI
 
 
-class InputZonesAndStations:
+class InputZonesAndStations(JsonSerialisable):
     """
     Class to create the zones and stations from the grid designer UI, then to send to SM.
 
@@ -19,6 +20,8 @@ class InputZonesAndStations:
         The grid designer UI.
     """
 
+    FILENAME = "reset-2.json"
+
     def __init__(self, grid_designer_ui: GridDesignerUI):
         self._create_zones(grid_designer_ui=grid_designer_ui)
         self._create_stations(grid_designer_ui=grid_designer_ui)
@@ -84,63 +87,83 @@ class InputZonesAndStations:
         # If it's both SM and TC obstacles, even z=0 is considered a void. Cells that
         # are not numbers, stations or buffers are all considered voids.
         if void_type == "SM and TC obstacles":
-            void_mask = ~(
-                grid_designer_ui.grid_data.map(lambda x: str(x).isdigit()).to_numpy()
-                | grid_designer_ui.grid_data.map(
-                    lambda x: str(x).startswith("P")
-                ).to_numpy()
-                | grid_designer_ui.grid_data.map(lambda x: str(x) == "B").to_numpy()
-            )
+            _, void_mask = grid_designer_ui.obstacle_masks
             start_z = 0
 
         # Otherwise if it's SM obstacles only, then skycars can still move at z=0 but
         # no stacks below them can be used. This are marked as buffer cells.
         elif void_type == "SM obstacles only":
-            void_mask = grid_designer_ui.grid_data.map(
-                lambda x: str(x) == "B"
-            ).to_numpy()
+            _, _, void_mask = grid_designer_ui.grid_classification
             start_z = 1
 
         else:
             raise SimulationFrontendException(f"Void type {void_type} not implemented")
 
-        # Get void coordinates
-        processed = numpy.zeros_like(void_mask, dtype=bool)
-        void_positions = numpy.argwhere(numpy.logical_and(void_mask, ~processed))
+        return self._voids_from_mask(
+            void_mask=void_mask, start_z=start_z, end_z=grid_designer_ui.z_size
+        )
+
+    @staticmethod
+    def _voids_from_mask(
+        void_mask: numpy.ndarray, start_z: int, end_z: int
+    ) -> List[InputVoid]:
+        """
+        Cover the void cells of a mask of the grid with rectangular voids.
+
+        Parameters
+        ----------
+        void_mask : numpy.ndarray
+            The mask of the void cells of the grid.
+        start_z : int
+            The z coordinate the voids start from.
+        end_z : int
+            The z coordinate the voids end at.
 
+        Returns
+        -------
+        List[InputVoid]
+            A list of voids.
+        """
         # Go through each void cells and expand them to the right and down until they
-        # hit a non-void cell. The voids can be overlapping.
-        rows, cols = void_mask.shape
+        # hit a non-void cell. The voids can be overlapping. The rows are swept from the
+        # top, and each void starts at a void cell that is not yet part of a void.
+        rows = void_mask.shape[0]
+        processed = numpy.zeros_like(void_mask, dtype=bool)
         voids = []
-        for start_y, start_x in void_positions:
-            if processed[start_y, start_x]:
-                continue
-
-            # Expand right
-            end_x = start_x
-            while end_x + 1 < cols and void_mask[start_y, end_x + 1]:
-                end_x += 1
-
-            # Expand down
-            end_y = start_y
-            while end_y + 1 < rows:
-                is_valid = True
-                for x in range(start_x, end_x + 1):
-                    if not void_mask[end_y + 1, x]:
-                        is_valid = False
-                        break
-                if not is_valid:
-                    break
-                end_y += 1
-
-            # Mark as processed
-            processed[start_y : end_y + 1, start_x : end_x + 1] = True
-
-            void = InputVoid(
-                from_=Coordinates(x=int(start_x), y=int(start_y), z=start_z),
-                to=Coordinates(x=int(end_x), y=int(end_y), z=grid_designer_ui.z_size),
-            )
-            voids.append(void)
+        for start_y in range(rows):
+            row = void_mask[start_y]
+
+            # End of the run of void cells that each void cell of the row is in
+            run_ends = numpy.flatnonzero(row & ~numpy.append(row[1:], False))
+
+            # Void cells of the row that are not yet part of a void. After each void,
+            # the cells it covers in the row are skipped in one step.
+            start_xs = numpy.flatnonzero(row & ~processed[start_y])
+            index = 0
+            while index < len(start_xs):
+                start_x = int(start_xs[index])
+
+                # Expand right
+                end_x = int(run_ends[numpy.searchsorted(run_ends, start_x)])
+
+                # Expand down
+                end_y = start_y
+                while (
+                    end_y + 1 < rows
+                    and void_mask[end_y + 1, start_x : end_x + 1].all()
+                ):
+                    end_y += 1
+
+                # Mark as processed
+                processed[start_y : end_y + 1, start_x : end_x + 1] = True
+
+                void = InputVoid(
+                    from_=Coordinates(x=start_x, y=start_y, z=start_z),
+                    to=Coordinates(x=end_x, y=end_y, z=end_z),
+                )
+                voids.append(void)
+
+                index = int(numpy.searchsorted(start_xs, end_x, side="right"))
 
         return voids
 
@@ -157,78 +180,73 @@ class InputZonesAndStations:
         station_height = grid_designer_ui.z_size - Parameters.STATION_HEIGHT_FROM_BOTTOM
 
         # Get the stations from the grid designer UI. Stations are marked with prefix 'P'.
-        # The list is sorted so it's implicitly assume that if a station has different
-        # drop and pick points, drop point will be listed first.
-        grid_data_array = grid_designer_ui.grid_data.to_numpy()
+        # The list is sorted so that the stations are listed in order of their cells.
         grid_stations = sorted(grid_designer_ui.station_cells.copy())
 
-        stations: List[InputStation] = []
+        # Location of each station cell, found in a single pass over the grid
+        _, is_station, _ = grid_designer_ui.grid_classification
+        station_ys, station_xs = numpy.nonzero(is_station)
+        station_locations = {
+            cell: (y, x)
+            for cell, y, x in zip(
+                grid_designer_ui.grid_array[station_ys, station_xs].tolist(),
+                station_ys.tolist(),
+                station_xs.tolist(),
+            )
+        }
+
+        # Group the drop and pick points by station code. The D or P after the station
+        # code indicates a drop or pick point. Otherwise drop and pick points are the
+        # same.
+        station_points: Dict[int, Dict[str, InputDropOrPick]] = {}
         for grid_station in grid_stations:
-            y, x = numpy.argwhere(grid_data_array == grid_station)[0].tolist()
-            station_number = int("".join(filter(str.isdigit, grid_station)))
-
-            # The second last character should be either D or P to indicate drop or pick
-            # point. Otherwise (like the condition below) drop and pick points are the
-            # same.
-            if grid_station[-2] not in ["D", "P"]:
-                drop = InputDropOrPick(
+            y, x = station_locations[grid_station]
+            code, point_type, _ = STATION_CELL_PATTERN.match(grid_station).groups()
+            points = station_points.setdefault(int(code), {})
+
+            if point_type != "P":
+                points["drop"] = InputDropOrPick(
                     coordinates=Coordinates(x=x, y=y, z=station_height), capacity=2
                 )
-                pick = InputDropOrPick(
+            if point_type != "D":
+                points["pick"] = InputDropOrPick(
                     coordinates=Coordinates(x=x, y=y, z=station_height), capacity=1
                 )
-                station = InputStation(code=station_number, drop=drop, pick=pick)
-                stations.append(station)
-
-            # If the station has both drop and pick points, then process them accordingly.
-            # Since we have already sorted the grid station input, drop point will be
-            # listed first, then pick point.
-            else:
-                if grid_station[-2] == "D":
-                    drop = InputDropOrPick(
-                        coordinates=Coordinates(x=x, y=y, z=station_height), capacity=2
-                    )
-                else:
-                    pick = InputDropOrPick(
-                        coordinates=Coordinates(x=x, y=y, z=station_height), capacity=1
-                    )
-                    station = InputStation(code=station_number, drop=drop, pick=pick)
-                    stations.append(station)
+
+        stations: List[InputStation] = []
+        for code, points in station_points.items():
+            if "drop" not in points or "pick" not in points:
+                raise SimulationFrontendException(
+                    f"Station P{code} must have both a drop point and a pick point"
+                )
+            stations.append(
+                InputStation(code=code, drop=points["drop"], pick=points["pick"])
+            )
 
         self.stations = stations
 
-    def to_json(
-        self, save: bool = False, filename: str = "reset-2.json", type: str = "str"
-    ) -> str:
+    @cached_property
+    def station_codes(self) -> List[int]:
+        """
+        The codes of the stations, collected once and shared by the inputs that list
+        the stations.
         """
-        Convert the input to a JSON string.
+        return [station.code for station in self.stations]
 
-        Parameters
-        ----------
-        save : bool, optional
-            Whether to save the input to a file, by default False.
-        filename : str, optional
-            The name of the file to save the input to, by default "reset-2.json".
-        type : str, optional
-            The type of the input; either "str" or "dict", by default "str".
+    def to_dict(self) -> dict:
+        """
+        Convert the zones and stations to a dictionary. The cached station codes are not
+        part of the input.
 
         Returns
         -------
-        str
-            The JSON string of the input.
+        dict
+            The dictionary of the zones and stations.
         """
-        json_str = json.dumps(
-            self, default=lambda o: o.__dict__, sort_keys=True, indent=4
-        )
-
-        if save:
-            with open(filename, "w") as file:
-                file.write(json_str)
-
-        if type == "str":
-            return json_str
-        elif type == "dict":
-            return json.loads(json_str)
+        return {
+            "zones": [zone.to_dict() for zone in self.zones],
+            "stations": [station.to_dict() for station in self.stations],
+        }
 
 
 class InputZone:
@@ -264,6 +282,8 @@ class InputZone:
         The name of the zone, by default Parameters.ZONE_NAME
     """
 
+    __slots__ = ("name", "fromX", "toX", "fromY", "toY", "fromZ", "toZ", "voids")
+
     def __init__(
         self,
         max_x: int,
@@ -281,24 +301,56 @@ class InputZone:
         self.toZ = max_z
         self.voids = voids
 
+    def to_dict(self) -> dict:
+        """
+        Convert the zone to a dictionary.
+
+        Returns
+        -------
+        dict
+            The dictionary of the zone.
+        """
+        return {
+            "name": self.name,
+            "fromX": self.fromX,
+            "toX": self.toX,
+            "fromY": self.fromY,
+            "toY": self.toY,
+            "fromZ": self.fromZ,
+            "toZ": self.toZ,
+            "voids": [void.to_dict() for void in self.voids],
+        }
+
 
 class InputVoid:
+    """
+    A void in the grid.
+
+    Parameters
+    ----------
+    from_ : Coordinates
+        The coordinates of the top-left corner of the void.
+    to : Coordinates
+        The coordinates of the bottom-right corner of the void.
+    """
+
+    __slots__ = ("to", "from_")
+
     def __init__(self, from_: Coordinates, to: Coordinates):
-        """
-        A void in the grid.
+        self.to = to
+        self.from_ = from_
 
-        Parameters
-        ----------
-        from_ : Coordinates
-            The coordinates of the top-left corner of the void.
-        to : Coordinates
-            The coordinates of the bottom-right corner of the void.
+    def to_dict(self) -> dict:
         """
-        self.to = to
+        Convert the void to a dictionary. Since from is a reserved keyword in Python,
+        the attribute from_ is renamed to from here.
 
-        # Since from is a reserved keyword in Python, we need to use a different way to
-        # set the attribute
-        setattr(self, "from", from_)
+        Returns
+        -------
+        dict
+            The dictionary of the void.
+        """
+        return {"to": self.to.to_dict(), "from": self.from_.to_dict()}
 
 
 class InputStation:
@@ -316,11 +368,28 @@ class InputStation:
         Information on pick point.
     """
 
+    __slots__ = ("code", "drop", "pick")
+
     def __init__(self, code: int, drop: InputDropOrPick, pick: InputDropOrPick):
         self.code = code
         self.drop = [drop]
         self.pick = [pick]
 
+    def to_dict(self) -> dict:
+        """
+        Convert the station to a dictionary.
+
+        Returns
+        -------
+        dict
+            The dictionary of the station.
+        """
+        return {
+            "code": self.code,
+            "drop": [drop.to_dict() for drop in self.drop],
+            "pick": [pick.to_dict() for pick in self.pick],
+        }
+
 
 class InputDropOrPick:
     """
@@ -339,6 +408,8 @@ class InputDropOrPick:
         The zone group of the drop or pick point, by default Parameters.ZONE_NAME.
     """
 
+    __slots__ = ("capacity", "hardwareIndex", "zoneGroup", "coordinate")
+
     def __init__(
         self,
         coordinates: Coordinates,
@@ -351,6 +422,22 @@ class InputDropOrPick:
         self.zoneGroup = zone_group
         self.coordinate = coordinates
 
+    def to_dict(self) -> dict:
+        """
+        Convert the drop or pick point to a dictionary.
+
+        Returns
+        -------
+        dict
+            The dictionary of the drop or pick point.
+        """
+        return {
+            "capacity": self.capacity,
+            "hardwareIndex": self.hardwareIndex,
+            "zoneGroup": self.zoneGroup,
+            "coordinate": self.coordinate.to_dict(),
+        }
+
 
 class Coordinates:
     """
@@ -366,7 +453,20 @@ class Coordinates:
         The z coordinate, by default 0.
     """
 
+    __slots__ = ("x", "y", "z")
+
     def __init__(self, x: int, y: int, z: int = 0):
         self.x = x
         self.y = y
         self.z = z
+
+    def to_dict(self) -> dict:
+        """
+        Convert the coordinates to a dictionary.
+
+        Returns
+        -------
+        dict
+            The dictionary of the coordinates.
+        """
+        return {"x": self.x, "y": self.y, "z": self.z}
@@ -0,0 +1,145 @@
+from abc import ABC, abstractmethod
+from typing import Optional, Union
+
+import orjson
+
+
+def dumps(data: dict, pretty: bool = False) -> bytes:
+    """
+    Serialise the dictionary of an input to JSON bytes with orjson.
+
+    Parameters
+    ----------
+    data : dict
+        The dictionary of the input.
+    pretty : bool, optional
+        Whether to indent the JSON with sorted keys, by default False
+
+    Returns
+    -------
+    bytes
+        The JSON bytes of the input.
+    """
+    option = orjson.OPT_SERIALIZE_NUMPY
+    if pretty:
+        option |= orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2
+    return orjson.dumps(data, option=option)
+
+
+def _write_bytes(filename: str, payload: bytes) -> None:
+    """
+    Write JSON bytes to a file as they are, without decoding them to a string first.
+
+    Parameters
+    ----------
+    filename : str
+        The name of the file to write to.
+    payload : bytes
+        The JSON bytes to write.
+    """
+    with open(filename, "wb") as file:
+        file.write(payload)
+
+
+def serialise(
+    data: dict,
+    save: bool = False,
+    filename: str = "input.json",
+    type: str = "str",
+    pretty: bool = False,
+) -> Union[str, dict]:
+    """
+    Serialise the dictionary of an input to JSON with orjson. The JSON string is
+    compact, as it is sent to the servers, while saved files are indented with sorted
+    keys to be read by people.
+
+    Parameters
+    ----------
+    data : dict
+        The dictionary of the input.
+    save : bool, optional
+        Whether to save the JSON string to a file, by default False
+    filename : str, optional
+        The name of the file to save the JSON string to, by default "input.json"
+    type : str, optional
+        The type of the output; either "str" or "dict", by default "str"
+    pretty : bool, optional
+        Whether to indent the JSON string with sorted keys even when it is not saved, by
+        default False
+
+    Returns
+    -------
+    Union[str, dict]
+        The JSON string or the dictionary of the input.
+    """
+    if type == "dict" and not save:
+        return data
+
+    payload = dumps(data, pretty=pretty or save)
+
+    if save:
+        _write_bytes(filename=filename, payload=payload)
+
+    if type == "str":
+        return payload.decode()
+    elif type == "dict":
+        return data
+
+
+class JsonSerialisable(ABC):
+    """
+    Base class for the inputs that convert themselves to a dictionary with to_dict, and
+    to JSON through it.
+    """
+
+    # Default name of the file the input is saved to.
+    FILENAME = "input.json"
+
+    @abstractmethod
+    def to_dict(self) -> dict:
+        """
+        Convert the input to a dictionary.
+
+        Returns
+        -------
+        dict
+            The dictionary of the input.
+        """
+
+    def to_json(
+        self,
+        save: bool = False,
+        filename: Optional[str] = None,
+        type: str = "str",
+        pretty: bool = False,
+    ) -> Union[str, dict]:
+        """
+        Convert the input to a JSON string.
+
+        Parameters
+        ----------
+        save : bool, optional
+            Whether to save the JSON string to a file, by default False
+        filename : Optional[str], optional
+            The name of the file to save the JSON string to, by default the FILENAME of
+            the input
+        type : str, optional
+            The type of the output; either "str" or "dict", by default "str"
+        pretty : bool, optional
+            Whether to indent the JSON string, by default False
+
+        Returns
+        -------
+        Union[str, dict]
+            The JSON string or the dictionary of the input.
+        """
+        if type == "dict" and not save:
+            return self.to_dict()
+
+        return serialise(
+            data=self.to_dict(),
+            save=save,
+            filename=filename or self.FILENAME,
+            type=type,
+            pretty=pretty,
+        )
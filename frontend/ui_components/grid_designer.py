@@ -1,13 +1,50 @@
 import math
 import re
 from pathlib import Path
-from typing import List
+from typing import List, Tuple
 
 import numpy
 import pandas
 import plotly.graph_objects as go
 import streamlit
 
+# Format of the station cells: "P", the station code, an optional D or P for a drop or
+# pick point, then I or O for inbound or outbound, e.g. "P12DI".
+STATION_CELL_PATTERN = re.compile(r"^P(\d+)([DP])?([IO])$")
+
+
+def classify_grid(
+    grid_array: numpy.ndarray,
+) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+    """
+    Classify the cells of the grid data. A grid has only a handful of distinct cell
+    values, so each distinct value is classified once and the classification is
+    broadcast back to the cells through their codes.
+
+    Parameters
+    ----------
+    grid_array : numpy.ndarray
+        The cells of the grid data.
+
+    Returns
+    -------
+    Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]
+        The masks of the free stack cells, the station cells and the buffer cells.
+    """
+    codes, values = pandas.factorize(grid_array.ravel(), use_na_sentinel=False)
+    codes = codes.reshape(grid_array.shape)
+    values = numpy.array([str(value) for value in values], dtype=str)
+    masks = (
+        numpy.char.isdigit(values)[codes],
+        numpy.char.startswith(values, "P")[codes],
+        (values == "B")[codes],
+    )
+
+    # The masks are shared by the inputs, so they are made read-only.
+    for mask in masks:
+        mask.setflags(write=False)
+    return masks
+
 
 class GridDesignerUI:
     """
@@ -23,8 +60,8 @@ class GridDesignerUI:
         The height of the grid in number of bins.
     grid_data : pandas.DataFrame
         The grid data previously imported as an Excel file..
-    stations : List[str]
-        The stations string from the grid data. Example inputs are "P1I", "P2DI", "P3PO".
+    station_cells : List[str]
+        The station cells from the grid data. Example inputs are "P1I", "P2DI", "P3PO".
     number_of_bins : int
         The number of bins in the grid.
     has_inbound : bool
@@ -49,6 +86,61 @@ class GridDesignerUI:
         self.has_outbound: bool = True
         self.station_code_groups = None
         self.desired_skycar_directions = None
+        self._grid_array = None
+        self._grid_classification = None
+        self._obstacle_masks = None
+        self._classified_grid_data: pandas.DataFrame = None
+
+    def _classify_grid_data(self):
+        """
+        Convert the grid data to an array, classify its cells and derive the obstacle
+        masks from the classification, unless the grid data has already been
+        classified.
+        """
+        if self._classified_grid_data is self.grid_data:
+            return
+
+        grid_array = self.grid_data.to_numpy()
+        grid_array.setflags(write=False)
+        is_free_stack, is_station, is_buffer = classify_grid(grid_array)
+        is_sm_obstacle = ~(is_free_stack | is_station)
+        is_tc_obstacle = is_sm_obstacle & ~is_buffer
+        is_sm_obstacle.setflags(write=False)
+        is_tc_obstacle.setflags(write=False)
+
+        self._grid_array = grid_array
+        self._grid_classification = (is_free_stack, is_station, is_buffer)
+        self._obstacle_masks = (is_sm_obstacle, is_tc_obstacle)
+        self._classified_grid_data = self.grid_data
+
+    @property
+    def grid_array(self) -> numpy.ndarray:
+        """
+        The cells of the grid data as a read-only array. The grid data is converted once
+        for each grid data, and the array is shared by the grid designer and the inputs.
+        """
+        self._classify_grid_data()
+        return self._grid_array
+
+    @property
+    def grid_classification(self) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """
+        The masks of the free stack cells, the station cells and the buffer cells of the
+        grid data. The cells are classified once for each grid data, and the masks are
+        shared by the inputs created from the grid.
+        """
+        self._classify_grid_data()
+        return self._grid_classification
+
+    @property
+    def obstacle_masks(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        The masks of the SM obstacles, which are the cells that are neither free stacks
+        nor stations, and of the TC obstacles, which are the SM obstacles that are not
+        buffers either. They are derived once for each grid data.
+        """
+        self._classify_grid_data()
+        return self._obstacle_masks
 
     def show(self) -> bool:
         """
@@ -93,9 +185,9 @@ class GridDesignerUI:
 
             # Convert grid data to numeric, coercing non-numeric values to NaN, then get
             # the maximum value, ignoring NaN
-            numeric_grid = pandas.to_numeric(grid_data.values.ravel(), errors="coerce")
-            self.z_size = int(numeric_grid[~numpy.isnan(numeric_grid)].max())
             self.grid_data = grid_data
+            numeric_grid = pandas.to_numeric(self.grid_array.ravel(), errors="coerce")
+            self.z_size = int(numeric_grid[~numpy.isnan(numeric_grid)].max())
 
             # Check whether the stations are valid.
             is_success = self._check_station_validity()
@@ -133,7 +225,7 @@ class GridDesignerUI:
             # If excel file is uploaded, then calculate the true gross number of spaces 
             # from grid.
             numeric_grid = pandas.to_numeric(
-                self.grid_data.values.ravel(), errors="coerce"
+                self.grid_array.ravel(), errors="coerce"
             )
             gross_number_of_spaces_from_grid = int(
                 numeric_grid[~numpy.isnan(numeric_grid)].sum()
@@ -306,9 +398,9 @@ class GridDesignerUI:
             True if the stations are valid, False otherwise.
         """
         # Find positions of all stations (cells starting with 'P')
-        station_mask = self.grid_data.map(lambda x: str(x).startswith("P")).to_numpy()
+        _, station_mask, _ = self.grid_classification
         station_positions = numpy.argwhere(station_mask)
-        station_cells = self.grid_data.values[
+        station_cells = self.grid_array[
             station_positions[:, 0], station_positions[:, 1]
         ].tolist()
 
@@ -325,12 +417,11 @@ class GridDesignerUI:
         # Validate station format and group by station code. Two station cells can
         # form a station cell group when one station cell is drop point and the other
         # is pick point.
-        pattern = r"^P(\d+)([DP])?([IO])$"
         station_cell_groups = {}
         has_inbound = has_outbound = False
 
         for station_cell in station_cells:
-            match = re.match(pattern, str(station_cell))
+            match = STATION_CELL_PATTERN.match(str(station_cell))
 
             # Check 3: Whether the station cell matches the required format
             if not match:
@@ -447,13 +538,17 @@ class GridDesignerUI:
             if submitted_button:
                 desired_skycar_directions = desired_skycar_directions.dropna(how="all")
 
-        # Validate if the directions are horizontal or vertical only
-        for arrow_index, group in desired_skycar_directions.groupby("arrow_index"):
-            # Sort by index to ensure points are in order of entry
-            group = group.sort_index()
+        # Validate if the directions are horizontal or vertical only. The points are
+        # sorted by index to ensure they are in order of entry, and each arrow is taken
+        # from the row positions of its points.
+        sorted_directions = desired_skycar_directions.sort_index()
+        coordinates = sorted_directions[["X", "Y"]].to_numpy()
+        arrows = sorted_directions.groupby("arrow_index").indices
+        for arrow_index, positions in arrows.items():
+            points = coordinates[positions].tolist()
 
             # Check if there are at least 2 points in each arrow
-            if len(group) < 2:
+            if len(points) < 2:
                 streamlit.error(
                     f"Arrow {arrow_index} has less than 2 points. No preferred "
                     + "direction will be added.",
@@ -462,13 +557,7 @@ class GridDesignerUI:
                 return None
 
             # Check each adjacent pair of points
-            for i in range(len(group) - 1):
-                current_point = group.iloc[i]
-                next_point = group.iloc[i + 1]
-
-                current_x, current_y = current_point["X"], current_point["Y"]
-                next_x, next_y = next_point["X"], next_point["Y"]
-
+            for (current_x, current_y), (next_x, next_y) in zip(points, points[1:]):
                 if (current_x != next_x and current_y != next_y) or (
                     current_x == next_x and current_y == next_y
                 ):
@@ -505,27 +594,18 @@ class GridDesignerUI:
             [1.0, "#2c4770"],
         ]
 
-        # Transform the copy of grid data to matrix from 0 to 4. The meaning of each 
-        # value follows the colour scale above.
-        grid_data_display = self.grid_data.copy()
+        # Transform the grid data to matrix from 0 to 4. The meaning of each value
+        # follows the colour scale above. The conditions are checked in order, from the
+        # shared classification of the grid cells.
+        is_free_stack, is_station, is_buffer = self.grid_classification
         grid_data_display = pandas.DataFrame(
-            numpy.where(
-                grid_data_display.map(lambda x: str(x).startswith("P")),
-                1,
-                numpy.where(
-                    grid_data_display.map(lambda x: str(x).isdigit()),
-                    0,
-                    numpy.where(
-                        grid_data_display.map(lambda x: pandas.isna(x)),
-                        4,
-                        numpy.where(
-                            grid_data_display.map(lambda x: str(x) == "B"), 2, 3
-                        ),
-                    ),
-                ),
+            numpy.select(
+                [is_station, is_free_stack, self.grid_data.isna().to_numpy(), is_buffer],
+                [1, 0, 4, 2],
+                default=3,
             ),
-            index=grid_data_display.index,
-            columns=grid_data_display.columns,
+            index=self.grid_data.index,
+            columns=self.grid_data.columns,
         )
 
         # Create a figure for the grid layout
@@ -567,23 +647,25 @@ class GridDesignerUI:
 
         # Add arrows to indicate the desired skycar directions
         if self.desired_skycar_directions is not None:
-            for _, arrow_points in self.desired_skycar_directions.groupby(
-                "arrow_index"
-            ):
+            coordinates = self.desired_skycar_directions[["X", "Y"]].to_numpy()
+            arrows = self.desired_skycar_directions.groupby("arrow_index").indices
+            for positions in arrows.values():
+                points = coordinates[positions].tolist()
+
                 # Process each segment of the arrow
-                for i in range(len(arrow_points) - 1):
-                    from_point = arrow_points.iloc[i]
-                    to_point = arrow_points.iloc[i + 1]
+                for i in range(len(points) - 1):
+                    from_x, from_y = points[i]
+                    to_x, to_y = points[i + 1]
 
                     # Determine if this is the last segment (needs arrowhead)
-                    is_last_segment = i == len(arrow_points) - 2
+                    is_last_segment = i == len(points) - 2
 
                     # Add line segment with arrowhead only for the last segment
                     fig.add_annotation(
-                        x=to_point["X"],
-                        y=to_point["Y"],
-                        ax=from_point["X"],
-                        ay=from_point["Y"],
+                        x=to_x,
+                        y=to_y,
+                        ax=from_x,
+                        ay=from_y,
                         xref="x",
                         yref="y",
                         axref="x",
@@ -637,7 +719,7 @@ class GridDesignerUI:
         station_codes = list(
             set(
                 [
-                    int(re.match(r"^P(\d+)([DP])?([IO])$", station).group(1))
+                    int(STATION_CELL_PATTERN.match(station).group(1))
                     for station in self.station_cells
                 ]
             )
@@ -689,10 +771,8 @@ class GridDesignerUI:
 
         # Create a mapping of station codes to their types for faster lookup
         station_types = {}
-        pattern = re.compile(r"^P(\d+)([DP])?([IO])$")
-
         for station in self.station_cells:
-            match = pattern.match(station)
+            match = STATION_CELL_PATTERN.match(station)
             station_code = int(match.group(1))
             station_type = match.group(3)
             station_types[station_code] = station_type
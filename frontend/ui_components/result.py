@@ -5,7 +5,7 @@ from typing import Dict, List, Tuple
 import pandas
 import plotly.graph_objects as go
 import streamlit
-from core.animation import Animation
+from core.animation import Animation, VideoSettings
 from core.simulation_database import SimulationDatabase
 from core.tc_database import MongoService
 
@@ -918,10 +918,15 @@ class ResultUI:
             "Upload the original grid excel file, then choose the period of time (in "
             + "simulation minutes) to animate. "
         )
+        max_video_minutes = (
+            VideoSettings.MAX_FRAMES * VideoSettings.FRAME_INTERVAL_MS / 1000 / 60
+        )
         streamlit.write(
             "The animation is sped up by 10x. In other words, 1 minute of animation is "
-            + "equivalent to 10 minutes of simulation. 1 minute of animation video "
-            + "generally takes about 1 minute to render."
+            + "equivalent to 10 minutes of simulation. Longer periods are sped up "
+            + f"further so that the video is at most {max_video_minutes:g} minute(s) "
+            + "long. 1 minute of animation video generally takes about 1 minute to "
+            + "render."
         )
 
         grid_excel_file = streamlit.file_uploader(
@@ -966,9 +971,10 @@ class ResultUI:
             is_animate = streamlit.button("Animate")
 
         if is_animate:
+            video_minutes = min((to_time_min - from_time_min) / 10, max_video_minutes)
             streamlit.info(
                 "Please wait for the animation to render (estimated time of waiting: "
-                + f"{int((to_time_min-from_time_min)/10)+1} min)"
+                + f"{int(video_minutes)+1} min)"
             )
             animation = Animation(
                 grid_data=grid_data,
@@ -1,3 +1,6 @@
+import hashlib
+
+import pandas
 import streamlit
 from input_creation.input_buffer import InputBuffer
 from input_creation.input_database import InputDatabase
@@ -31,6 +34,12 @@ class SimulationPreparationUI:
         self.grid_designer_ui = grid_designer_ui
         self.simulation_input_ui = simulation_input_ui
 
+        # Cache is used to store the zones and stations so that they are not rebuilt
+        # every time the page reruns with the same grid. Initialise the cache if it
+        # does not exist.
+        if "zones_and_stations_cache" not in streamlit.session_state:
+            streamlit.session_state.zones_and_stations_cache = {}
+
     def show(self) -> bool:
         """
         Show the simulation preparation UI.
@@ -53,9 +62,7 @@ class SimulationPreparationUI:
             return False
 
         # Create input objects
-        input_zones_and_stations = InputZonesAndStations(
-            grid_designer_ui=self.grid_designer_ui
-        )
+        input_zones_and_stations = self._get_input_zones_and_stations()
         input_sm_obstacles = InputSMObstacles(grid_designer_ui=self.grid_designer_ui)
         input_buffer = InputBuffer(buffer_ratio=self.grid_designer_ui.buffer_ratio)
         input_skycar_setup = InputSkyCarSetup(
@@ -80,59 +87,59 @@ class SimulationPreparationUI:
             input_simulation=input_simulation,
         )
 
-        # Option to show request files
+        # Option to show request files, indented with sorted keys to be read by people
         is_show_files = streamlit.checkbox("Show request files")
         if is_show_files:
             with streamlit.expander("reset-2.json: Zones and Stations"):
-                json_data = input_zones_and_stations.to_json()
+                json_data = input_zones_and_stations.to_json(pretty=True)
                 self._show_individual_json_file(
                     json_data=json_data, file_name="reset-2.json"
                 )
 
             with streamlit.expander("reset-3.json: SM Obstacles"):
-                json_data = input_sm_obstacles.to_json()
+                json_data = input_sm_obstacles.to_json(pretty=True)
                 self._show_individual_json_file(
                     json_data=json_data, file_name="reset-3.json"
                 )
 
             with streamlit.expander("reset-4.json: Buffer"):
-                json_data = input_buffer.to_json()
+                json_data = input_buffer.to_json(pretty=True)
                 self._show_individual_json_file(
                     json_data=json_data, file_name="reset-4.json"
                 )
 
             with streamlit.expander("reset-5.json: Skycar Setup"):
-                json_data = input_skycar_setup.to_json()
+                json_data = input_skycar_setup.to_json(pretty=True)
                 self._show_individual_json_file(
                     json_data=json_data, file_name="reset-5.json"
                 )
 
             with streamlit.expander("reset-6.json: TC Obstacles"):
-                json_data = input_tc_obstacles.to_json()
+                json_data = input_tc_obstacles.to_json(pretty=True)
                 self._show_individual_json_file(
                     json_data=json_data, file_name="reset-6.json"
                 )
 
             with streamlit.expander("reset-7.json: Skycar Constraints"):
-                json_data = input_skycar_constraints.to_json()
+                json_data = input_skycar_constraints.to_json(pretty=True)
                 self._show_individual_json_file(
                     json_data=json_data, file_name="reset-7.json"
                 )
 
             with streamlit.expander("reset-autostore.json: Autostore"):
-                json_data = input_autostore.to_json()
+                json_data = input_autostore.to_json(pretty=True)
                 self._show_individual_json_file(
                     json_data=json_data, file_name="reset-autostore.json"
                 )
 
             with streamlit.expander("reset-simulation.json: Simulation"):
-                json_data = input_simulation.to_json()
+                json_data = input_simulation.to_json(pretty=True)
                 self._show_individual_json_file(
                     json_data=json_data, file_name="reset-simulation.json"
                 )
 
             with streamlit.expander("reset-database.json: Database"):
-                json_data = input_database.to_json()
+                json_data = input_database.to_json(pretty=True)
                 self._show_individual_json_file(
                     json_data=json_data, file_name="reset-database.json"
                 )
@@ -150,6 +157,36 @@ class SimulationPreparationUI:
 
         return True
 
+    def _get_input_zones_and_stations(self) -> InputZonesAndStations:
+        """
+        Get the zones and stations of the grid, from the cache if the same grid has
+        already been converted. The grid designer is rebuilt on every rerun, so the grid
+        is recognised by a hash of its cells rather than by the grid designer itself.
+
+        Returns
+        -------
+        InputZonesAndStations
+            The zones and stations of the grid.
+        """
+        grid_data = self.grid_designer_ui.grid_data
+        cell_hashes = pandas.util.hash_pandas_object(grid_data, index=False)
+        grid_hash = hashlib.blake2b(
+            cell_hashes.to_numpy().tobytes(), digest_size=16
+        ).hexdigest()
+        cache_key = (
+            f"zones_{grid_data.shape[0]}x{grid_data.shape[1]}_"
+            f"{self.grid_designer_ui.z_size}_{grid_hash}"
+        )
+
+        cache = streamlit.session_state.zones_and_stations_cache
+        if cache_key not in cache:
+            # Only the latest grid is kept, as earlier grids are rarely uploaded again.
+            cache.clear()
+            cache[cache_key] = InputZonesAndStations(
+                grid_designer_ui=self.grid_designer_ui
+            )
+        return cache[cache_key]
+
     def _show_individual_json_file(self, json_data: str, file_name: str):
         """
         Helper method to show individual JSON files and allow download.